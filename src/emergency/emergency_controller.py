@@ -7,10 +7,13 @@ file-based emergency stops, graceful shutdown procedures, and safety monitoring.
 
 import os
 import time
+import types
+import queue
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Mapping, Union
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
@@ -37,7 +40,37 @@ class EmergencyType(Enum):
     NETWORK_FAILURE = "network_failure"
 
 
-@dataclass
+@dataclass(slots=True)
+class StopFileMetadata:
+    """Metadata for emergency stop file events"""
+    file_path: str
+
+
+@dataclass(slots=True)
+class DailyLossMetadata:
+    """Metadata for daily loss limit events"""
+    current_loss: float
+    limit: float
+
+
+@dataclass(slots=True)
+class HeartbeatTimeoutMetadata:
+    """Metadata for heartbeat timeout events"""
+    timeout_seconds: float
+
+
+@dataclass(slots=True)
+class ShutdownMetadata:
+    """Metadata for emergency shutdown completion events"""
+    shutdown_duration: float
+    reason: str
+
+
+EventMetadata = Union[StopFileMetadata, DailyLossMetadata, HeartbeatTimeoutMetadata,
+                      ShutdownMetadata, Dict[str, Any]]
+
+
+@dataclass(slots=True)
 class EmergencyEvent:
     """Represents an emergency event"""
     event_type: EmergencyType
@@ -45,7 +78,7 @@ class EmergencyEvent:
     message: str
     timestamp: datetime
     source: str
-    metadata: Dict[str, Any]
+    metadata: EventMetadata
     resolved: bool = False
     resolution_time: Optional[datetime] = None
 
@@ -85,10 +118,22 @@ class EmergencyController:
         # Graceful shutdown configuration
         self.shutdown_timeout = config.get('shutdown_timeout', 300)  # 5 minutes
         self.force_close_after_timeout = config.get('force_close_after_timeout', True)
+        self.emergency_close_workers = config.get('emergency_close_workers', 16)
+        
+        # Guards state transitions shared by the monitor, shutdown, callback
+        # and caller threads; re-entrant because transitions nest
+        self._state_lock = threading.RLock()
         
         # Monitoring state
         self.monitoring_active = False
         self.monitor_thread: Optional[threading.Thread] = None
+        self.watch_stop_file = config.get('watch_stop_file', True)
+        self.check_system_health = config.get('check_system_health', True)
+        self.process_pending_events = config.get('process_pending_events', True)
+        self._stop_file_check: Optional[Callable[[datetime], None]] = None
+        # Stop file state as last seen by the file watcher, None until it has run
+        self._stop_file_present: Optional[bool] = None
+        self._tick_callables: tuple = ()
         self.emergency_events: List[EmergencyEvent] = []
         self.shutdown_in_progress = False
         
@@ -97,14 +142,35 @@ class EmergencyController:
             emergency_type: [] for emergency_type in EmergencyType
         }
         
+        # Emergency callbacks run on a worker thread so a slow callback
+        # cannot stall the monitoring loop
+        self._callback_queue: queue.Queue = queue.Queue()
+        self._callback_thread: Optional[threading.Thread] = None
+        # (event id, callback) pairs queued but not yet run; unresolved events
+        # are re-dispatched every tick, so a pair is only queued once at a time
+        self._pending_callbacks: set = set()
+        self._pending_lock = threading.Lock()
+        
         # Position management
-        self.active_trades: Dict[str, Trade] = {}
+        self.active_trades: Mapping[str, Trade] = types.MappingProxyType({})
         self.position_close_callbacks: List[Callable] = []
         
-        # System health tracking
+        # Order cancellation (bulk callback preferred over per-order callbacks)
+        self.pending_order_ids: List[str] = []
+        self.bulk_cancel_callback: Optional[Callable[[List[str]], None]] = None
+        self.order_cancel_callbacks: List[Callable[[str], None]] = []
+        
+        # System health tracking (wall clock for reporting, monotonic for timeouts)
         self.last_heartbeat = datetime.now()
+        self.last_heartbeat_monotonic: float = time.monotonic()
         self.heartbeat_timeout = config.get('heartbeat_timeout', 60)  # seconds
         
+        # Status fields that never change after initialization
+        self._status_template: Dict[str, Any] = {
+            'daily_loss_limit': self.daily_loss_limit,
+            'emergency_stop_file': self.emergency_stop_file
+        }
+        
         self.logger.info("EmergencyController initialized")
     
     def start_monitoring(self) -> bool:
@@ -120,12 +186,23 @@ class EmergencyController:
                 return True
             
             self.monitoring_active = True
+            self._build_tick_callables()
+            
+            self._callback_thread = threading.Thread(
+                target=self._callback_worker,
+                daemon=True
+            )
+            self._callback_thread.start()
+            
             self.monitor_thread = threading.Thread(
                 target=self._monitoring_loop,
                 daemon=True
             )
             self.monitor_thread.start()
             
+            # Daily loss is checked on update; catch a breach reported before monitoring began
+            self._check_daily_loss_limits(datetime.now())
+            
             self.logger.info("Emergency monitoring started")
             return True
             
@@ -143,49 +220,84 @@ class EmergencyController:
                 if self.monitor_thread.is_alive():
                     self.logger.warning("Emergency monitor thread did not stop gracefully")
             
+            if self._callback_thread and self._callback_thread.is_alive():
+                self._callback_queue.put(None)
+                self._callback_thread.join(timeout=10)
+                if self._callback_thread.is_alive():
+                    self.logger.warning("Emergency callback thread did not stop gracefully")
+            
             self.logger.info("Emergency monitoring stopped")
             
         except Exception as e:
             self.logger.error(f"Error stopping emergency monitoring: {e}")
     
+    def _build_tick_callables(self) -> None:
+        """Resolve the enabled per-tick checks once so the loop carries no config branches"""
+        self._stop_file_check = self._check_emergency_stop_file if self.watch_stop_file else None
+        self._stop_file_present = None
+        
+        checks: List[Callable[[datetime], None]] = []
+        if self.check_system_health:
+            checks.append(self._check_system_health)
+        if self.process_pending_events:
+            checks.append(self._process_emergency_events)
+        self._tick_callables = tuple(checks)
+    
     def _monitoring_loop(self) -> None:
         """Main emergency monitoring loop"""
         self.logger.info("Emergency monitoring loop started")
         
+        stop_file_check = self._stop_file_check
+        tick_callables = self._tick_callables
+        
         while self.monitoring_active:
             try:
-                # Check emergency stop file
-                self._check_emergency_stop_file()
+                # Single timestamp shared by every check in this tick
+                now = datetime.now()
                 
-                # Check daily loss limits
-                self._check_daily_loss_limits()
+                # Check emergency stop file
+                if stop_file_check is not None:
+                    stop_file_check(now)
                 
-                # Check system health
-                self._check_system_health()
+                # While a shutdown is running only the stop file is watched;
+                # further checks would just raise duplicate events
+                if self.shutdown_in_progress:
+                    self.last_heartbeat = now
+                    self.last_heartbeat_monotonic = time.monotonic()
+                    time.sleep(self.emergency_stop_check_interval)
+                    continue
                 
-                # Process pending emergency events
-                self._process_emergency_events()
+                # System health and pending event checks
+                for check in tick_callables:
+                    check(now)
                 
                 # Update heartbeat
-                self.last_heartbeat = datetime.now()
+                self.last_heartbeat = now
+                self.last_heartbeat_monotonic = time.monotonic()
                 
                 # Sleep until next check
                 time.sleep(self.emergency_stop_check_interval)
                 
             except Exception as e:
-                self.logger.error(f"Error in emergency monitoring loop: {e}")
+                self.logger.error("Error in emergency monitoring loop: %s", e)
                 time.sleep(5)  # Short sleep on error
         
         self.logger.info("Emergency monitoring loop ended")
     
-    def _check_emergency_stop_file(self) -> None:
+    def _check_emergency_stop_file(self, now: datetime) -> None:
         """Check for emergency stop file"""
         try:
             file_exists = os.path.exists(self.emergency_stop_file)
             
-            if file_exists and not self.emergency_stop_active:
+            with self._state_lock:
+                self._stop_file_present = file_exists
+                activated = file_exists and not self.emergency_stop_active
+                deactivated = not file_exists and self.emergency_stop_active
+                if activated or deactivated:
+                    self.emergency_stop_active = file_exists
+            
+            if activated:
                 # Emergency stop activated
-                self.emergency_stop_active = True
                 
                 # Read emergency stop message if available
                 message = "Emergency stop file detected"
@@ -202,112 +314,140 @@ class EmergencyController:
                     event_type=EmergencyType.MANUAL_STOP,
                     level=EmergencyLevel.CRITICAL,
                     message=message,
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     source="emergency_file",
-                    metadata={'file_path': self.emergency_stop_file}
+                    metadata=StopFileMetadata(self.emergency_stop_file)
                 )
                 
                 self._trigger_emergency_event(event)
                 
-            elif not file_exists and self.emergency_stop_active:
+            elif deactivated:
                 # Emergency stop deactivated
-                self.emergency_stop_active = False
                 self.logger.info("Emergency stop deactivated - file removed")
                 
                 # Mark previous emergency events as resolved
-                for event in self.emergency_events:
-                    if (event.event_type == EmergencyType.MANUAL_STOP and 
-                        not event.resolved):
-                        event.resolved = True
-                        event.resolution_time = datetime.now()
+                with self._state_lock:
+                    for event in self.emergency_events:
+                        if (event.event_type == EmergencyType.MANUAL_STOP and 
+                            not event.resolved):
+                            event.resolved = True
+                            event.resolution_time = now
                         
         except Exception as e:
-            self.logger.error(f"Error checking emergency stop file: {e}")
+            self.logger.error("Error checking emergency stop file: %s", e)
     
-    def _check_daily_loss_limits(self) -> None:
+    def _check_daily_loss_limits(self, now: datetime) -> None:
         """Check daily loss limits"""
         try:
-            if (self.current_daily_loss >= self.daily_loss_limit and 
-                not self.daily_loss_limit_breached):
-                
-                self.daily_loss_limit_breached = True
-                
+            with self._state_lock:
+                breached = (self.current_daily_loss >= self.daily_loss_limit and
+                            not self.daily_loss_limit_breached)
+                if breached:
+                    self.daily_loss_limit_breached = True
+            
+            if breached:
                 event = EmergencyEvent(
                     event_type=EmergencyType.DAILY_LOSS_LIMIT,
                     level=EmergencyLevel.CRITICAL,
                     message=f"Daily loss limit breached: ₹{self.current_daily_loss:,.2f} >= ₹{self.daily_loss_limit:,.2f}",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     source="risk_monitor",
-                    metadata={
-                        'current_loss': self.current_daily_loss,
-                        'limit': self.daily_loss_limit
-                    }
+                    metadata=DailyLossMetadata(self.current_daily_loss, self.daily_loss_limit)
                 )
                 
                 self._trigger_emergency_event(event)
                 
         except Exception as e:
-            self.logger.error(f"Error checking daily loss limits: {e}")
+            self.logger.error("Error checking daily loss limits: %s", e)
     
-    def _check_system_health(self) -> None:
+    def _check_system_health(self, now: datetime) -> None:
         """Check system health indicators"""
         try:
-            # Check heartbeat timeout
-            time_since_heartbeat = (datetime.now() - self.last_heartbeat).total_seconds()
+            # Check heartbeat timeout on the monotonic clock so wall-clock
+            # adjustments (NTP, DST) cannot raise false timeouts
+            time_since_heartbeat = time.monotonic() - self.last_heartbeat_monotonic
             
             if time_since_heartbeat > self.heartbeat_timeout:
                 event = EmergencyEvent(
                     event_type=EmergencyType.SYSTEM_ERROR,
                     level=EmergencyLevel.HIGH,
                     message=f"System heartbeat timeout: {time_since_heartbeat:.1f}s",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     source="health_monitor",
-                    metadata={'timeout_seconds': time_since_heartbeat}
+                    metadata=HeartbeatTimeoutMetadata(time_since_heartbeat)
                 )
                 
                 self._trigger_emergency_event(event)
                 
         except Exception as e:
-            self.logger.error(f"Error checking system health: {e}")
+            self.logger.error("Error checking system health: %s", e)
     
-    def _process_emergency_events(self) -> None:
+    def _process_emergency_events(self, now: datetime) -> None:
         """Process pending emergency events"""
         try:
-            unresolved_events = [e for e in self.emergency_events if not e.resolved]
+            with self._state_lock:
+                unresolved_events = [e for e in self.emergency_events if not e.resolved]
             
             for event in unresolved_events:
                 # Execute callbacks for this event type
-                callbacks = self.emergency_callbacks.get(event.event_type, [])
-                for callback in callbacks:
-                    try:
-                        callback(event)
-                    except Exception as e:
-                        self.logger.error(f"Error executing emergency callback: {e}")
+                self._dispatch_callbacks(event)
                         
         except Exception as e:
-            self.logger.error(f"Error processing emergency events: {e}")
+            self.logger.error("Error processing emergency events: %s", e)
+    
+    def _dispatch_callbacks(self, event: EmergencyEvent) -> None:
+        """Hand event callbacks to the callback worker, or run them inline if it is not running"""
+        callbacks = self.emergency_callbacks.get(event.event_type, [])
+        
+        if self._callback_thread and self._callback_thread.is_alive():
+            for callback in callbacks:
+                key = (id(event), callback)
+                with self._pending_lock:
+                    if key in self._pending_callbacks:
+                        continue
+                    self._pending_callbacks.add(key)
+                self._callback_queue.put((event, callback))
+            return
+        
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error("Error executing emergency callback: %s", e)
+    
+    def _callback_worker(self) -> None:
+        """Execute queued emergency callbacks until a stop sentinel is received"""
+        while True:
+            item = self._callback_queue.get()
+            if item is None:
+                break
+            
+            event, callback = item
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error("Error executing emergency callback: %s", e)
+            finally:
+                with self._pending_lock:
+                    self._pending_callbacks.discard((id(event), callback))
     
     def _trigger_emergency_event(self, event: EmergencyEvent) -> None:
         """Trigger an emergency event"""
         try:
-            self.emergency_events.append(event)
+            with self._state_lock:
+                self.emergency_events.append(event)
             
-            self.logger.critical(f"EMERGENCY EVENT: {event.event_type.value} - {event.message}")
+            self.logger.critical("EMERGENCY EVENT: %s - %s", event.event_type.value, event.message)
             
             # Execute immediate callbacks
-            callbacks = self.emergency_callbacks.get(event.event_type, [])
-            for callback in callbacks:
-                try:
-                    callback(event)
-                except Exception as e:
-                    self.logger.error(f"Error executing emergency callback: {e}")
+            self._dispatch_callbacks(event)
             
             # For critical events, initiate emergency shutdown
             if event.level == EmergencyLevel.CRITICAL:
                 self.initiate_emergency_shutdown(event.message)
                 
         except Exception as e:
-            self.logger.error(f"Error triggering emergency event: {e}")
+            self.logger.error("Error triggering emergency event: %s", e)
     
     def initiate_emergency_shutdown(self, reason: str) -> None:
         """
@@ -317,12 +457,13 @@ class EmergencyController:
             reason: Reason for emergency shutdown
         """
         try:
-            if self.shutdown_in_progress:
-                self.logger.warning("Emergency shutdown already in progress")
-                return
-            
-            self.shutdown_in_progress = True
-            self.logger.critical(f"INITIATING EMERGENCY SHUTDOWN: {reason}")
+            with self._state_lock:
+                if self.shutdown_in_progress:
+                    self.logger.warning("Emergency shutdown already in progress")
+                    return
+                
+                self.shutdown_in_progress = True
+            self.logger.critical("INITIATING EMERGENCY SHUTDOWN: %s", reason)
             
             # Start shutdown in separate thread to avoid blocking
             shutdown_thread = threading.Thread(
@@ -333,13 +474,13 @@ class EmergencyController:
             shutdown_thread.start()
             
         except Exception as e:
-            self.logger.error(f"Error initiating emergency shutdown: {e}")
+            self.logger.error("Error initiating emergency shutdown: %s", e)
     
     def _execute_emergency_shutdown(self, reason: str) -> None:
         """Execute emergency shutdown procedure"""
         try:
             shutdown_start = datetime.now()
-            self.logger.info(f"Executing emergency shutdown: {reason}")
+            self.logger.info("Executing emergency shutdown: %s", reason)
             
             # Step 1: Close all open positions
             self._close_all_positions_emergency(reason)
@@ -352,62 +493,100 @@ class EmergencyController:
             
             # Step 4: Force close any remaining positions if timeout exceeded
             if self.force_close_after_timeout:
-                elapsed = (datetime.now() - shutdown_start).total_seconds()
+                now = datetime.now()
+                elapsed = (now - shutdown_start).total_seconds()
                 if elapsed > self.shutdown_timeout:
                     self.logger.warning("Shutdown timeout exceeded - forcing position closure")
-                    self._force_close_remaining_positions()
+                    self._force_close_remaining_positions(now)
             
             # Step 5: Log shutdown completion
-            shutdown_duration = (datetime.now() - shutdown_start).total_seconds()
-            self.logger.info(f"Emergency shutdown completed in {shutdown_duration:.1f}s")
+            completed_at = datetime.now()
+            shutdown_duration = (completed_at - shutdown_start).total_seconds()
+            self.logger.info("Emergency shutdown completed in %.1fs", shutdown_duration)
             
             # Step 6: Create shutdown completion event
             completion_event = EmergencyEvent(
                 event_type=EmergencyType.SYSTEM_ERROR,
                 level=EmergencyLevel.MEDIUM,
                 message=f"Emergency shutdown completed: {reason}",
-                timestamp=datetime.now(),
+                timestamp=completed_at,
                 source="emergency_controller",
-                metadata={
-                    'shutdown_duration': shutdown_duration,
-                    'reason': reason
-                }
+                metadata=ShutdownMetadata(shutdown_duration, reason)
             )
-            self.emergency_events.append(completion_event)
+            with self._state_lock:
+                self.emergency_events.append(completion_event)
             
         except Exception as e:
-            self.logger.error(f"Error during emergency shutdown execution: {e}")
+            self.logger.error("Error during emergency shutdown execution: %s", e)
         finally:
-            self.shutdown_in_progress = False
+            with self._state_lock:
+                self.shutdown_in_progress = False
     
     def _close_all_positions_emergency(self, reason: str) -> None:
         """Close all positions in emergency mode"""
         try:
-            self.logger.info(f"Closing {len(self.active_trades)} positions - Emergency: {reason}")
+            self.logger.info("Closing %d positions - Emergency: %s", len(self.active_trades), reason)
             
-            for trade_id, trade in self.active_trades.items():
-                if trade.status == TradeStatus.OPEN:
-                    # Execute position close callbacks
-                    for callback in self.position_close_callbacks:
-                        try:
-                            callback(trade_id, reason, emergency=True)
-                        except Exception as e:
-                            self.logger.error(f"Error in position close callback for {trade_id}: {e}")
+            open_trade_ids = [trade_id for trade_id, trade in self.active_trades.items()
+                              if trade.status == TradeStatus.OPEN]
+            if not open_trade_ids or not self.position_close_callbacks:
+                return
+            
+            # Close callbacks are broker round trips, so run them concurrently
+            executor = ThreadPoolExecutor(max_workers=self.emergency_close_workers)
+            try:
+                future_to_trade = {
+                    executor.submit(callback, trade_id, reason, emergency=True): trade_id
+                    for trade_id in open_trade_ids
+                    for callback in self.position_close_callbacks
+                }
+                
+                try:
+                    for future in as_completed(future_to_trade, timeout=self.shutdown_timeout):
+                        error = future.exception()
+                        if error is not None:
+                            trade_id = future_to_trade[future]
+                            self.logger.error("Error in position close callback for %s: %s", trade_id, error)
+                except FuturesTimeoutError:
+                    pending = sum(1 for future in future_to_trade if not future.done())
+                    self.logger.warning("%d position close callbacks still running after %ss",
+                                        pending, self.shutdown_timeout)
+            finally:
+                executor.shutdown(wait=False)
             
         except Exception as e:
-            self.logger.error(f"Error closing positions in emergency: {e}")
+            self.logger.error("Error closing positions in emergency: %s", e)
     
     def _cancel_all_pending_orders(self) -> None:
         """Cancel all pending orders"""
         try:
-            self.logger.info("Cancelling all pending orders")
+            order_ids = list(self.pending_order_ids)
+            self.logger.info("Cancelling %d pending orders", len(order_ids))
+            
+            if not order_ids:
+                return
+            
+            if self.bulk_cancel_callback:
+                # One broker round trip for the whole batch
+                try:
+                    self.bulk_cancel_callback(order_ids)
+                except Exception as e:
+                    self.logger.error("Error in bulk order cancel callback: %s", e)
+            elif self.order_cancel_callbacks:
+                for order_id in order_ids:
+                    for callback in self.order_cancel_callbacks:
+                        try:
+                            callback(order_id)
+                        except Exception as e:
+                            self.logger.error("Error in order cancel callback for %s: %s", order_id, e)
+            else:
+                self.logger.warning("No order cancel callback registered - pending orders left open")
+                return
             
-            # This would typically interface with the order manager
-            # For now, we'll log the action
             self.logger.info("Pending order cancellation completed")
             
         except Exception as e:
-            self.logger.error(f"Error cancelling pending orders: {e}")
+            self.logger.error("Error cancelling pending orders: %s", e)
     
     def _wait_for_position_closure(self, start_time: datetime) -> None:
         """Wait for position closure with timeout"""
@@ -421,7 +600,7 @@ class EmergencyController:
                     self.logger.info("All positions closed successfully")
                     return
                 
-                self.logger.info(f"Waiting for {open_positions} positions to close...")
+                self.logger.info("Waiting for %d positions to close...", open_positions)
                 time.sleep(5)
             
             # Timeout reached
@@ -429,29 +608,29 @@ class EmergencyController:
                                     if trade.status == TradeStatus.OPEN)
             
             if remaining_positions > 0:
-                self.logger.warning(f"Shutdown timeout reached with {remaining_positions} positions still open")
+                self.logger.warning("Shutdown timeout reached with %d positions still open", remaining_positions)
                 
         except Exception as e:
-            self.logger.error(f"Error waiting for position closure: {e}")
+            self.logger.error("Error waiting for position closure: %s", e)
     
-    def _force_close_remaining_positions(self) -> None:
+    def _force_close_remaining_positions(self, now: datetime) -> None:
         """Force close any remaining open positions"""
         try:
             remaining_trades = [trade for trade in self.active_trades.values() 
                               if trade.status == TradeStatus.OPEN]
             
             if remaining_trades:
-                self.logger.warning(f"Force closing {len(remaining_trades)} remaining positions")
+                self.logger.warning("Force closing %d remaining positions", len(remaining_trades))
                 
                 for trade in remaining_trades:
                     # Mark as force closed
                     trade.status = TradeStatus.CLOSED
-                    trade.exit_time = datetime.now()
+                    trade.exit_time = now
                     
-                    self.logger.warning(f"Force closed trade {trade.trade_id}")
+                    self.logger.warning("Force closed trade %s", trade.trade_id)
             
         except Exception as e:
-            self.logger.error(f"Error force closing positions: {e}")
+            self.logger.error("Error force closing positions: %s", e)
     
     def register_emergency_callback(self, event_type: EmergencyType, 
                                   callback: Callable[[EmergencyEvent], None]) -> None:
@@ -478,23 +657,70 @@ class EmergencyController:
         self.position_close_callbacks.append(callback)
         self.logger.info("Registered position close callback")
     
+    def register_bulk_cancel_callback(self, callback: Callable[[List[str]], None]) -> None:
+        """
+        Register callback that cancels a batch of orders in one call.
+        
+        When registered, it takes precedence over per-order cancel callbacks.
+        
+        Args:
+            callback: Callback function (order_ids)
+        """
+        self.bulk_cancel_callback = callback
+        self.logger.info("Registered bulk order cancel callback")
+    
+    def register_order_cancel_callback(self, callback: Callable[[str], None]) -> None:
+        """
+        Register callback that cancels a single order.
+        
+        Args:
+            callback: Callback function (order_id)
+        """
+        self.order_cancel_callbacks.append(callback)
+        self.logger.info("Registered order cancel callback")
+    
     def update_daily_loss(self, loss_amount: float) -> None:
         """
         Update current daily loss amount.
         
+        The daily loss limit is enforced here rather than polled from the
+        monitoring loop, so a breach is raised as soon as it is reported.
+        
         Args:
             loss_amount: Current daily loss amount
         """
-        self.current_daily_loss = abs(loss_amount)  # Ensure positive value
+        current_loss = -loss_amount if loss_amount < 0 else loss_amount  # Ensure positive value
+        self.current_daily_loss = current_loss
+        
+        if (self.monitoring_active and current_loss >= self.daily_loss_limit and
+                not self.daily_loss_limit_breached):
+            self._check_daily_loss_limits(datetime.now())
     
     def update_active_trades(self, trades: Dict[str, Trade]) -> None:
         """
         Update active trades for monitoring.
         
+        The controller keeps a read-only view of the caller's dictionary
+        rather than a copy; the caller owns the dictionary and any mutation
+        of it is visible here.
+        
         Args:
             trades: Dictionary of active trades
         """
-        self.active_trades = trades.copy()
+        if not isinstance(trades, types.MappingProxyType):
+            trades = types.MappingProxyType(trades)
+        
+        with self._state_lock:
+            self.active_trades = trades
+    
+    def update_pending_orders(self, order_ids: List[str]) -> None:
+        """
+        Update pending order IDs to cancel on emergency shutdown.
+        
+        Args:
+            order_ids: IDs of orders that are still pending
+        """
+        self.pending_order_ids = list(order_ids)
     
     def create_emergency_stop_file(self, message: str = "") -> bool:
         """
@@ -547,21 +773,31 @@ class EmergencyController:
             Dictionary with emergency status information
         """
         try:
-            unresolved_events = [e for e in self.emergency_events if not e.resolved]
-            
-            return {
-                'emergency_stop_active': self.emergency_stop_active,
-                'daily_loss_limit_breached': self.daily_loss_limit_breached,
-                'shutdown_in_progress': self.shutdown_in_progress,
-                'monitoring_active': self.monitoring_active,
-                'current_daily_loss': self.current_daily_loss,
-                'daily_loss_limit': self.daily_loss_limit,
-                'unresolved_events': len(unresolved_events),
-                'total_events': len(self.emergency_events),
-                'last_heartbeat': self.last_heartbeat.isoformat(),
-                'emergency_stop_file': self.emergency_stop_file,
-                'emergency_stop_file_exists': os.path.exists(self.emergency_stop_file)
-            }
+            status = self._status_template.copy()
+            
+            with self._state_lock:
+                status.update({
+                    'emergency_stop_active': self.emergency_stop_active,
+                    'daily_loss_limit_breached': self.daily_loss_limit_breached,
+                    'shutdown_in_progress': self.shutdown_in_progress,
+                    'monitoring_active': self.monitoring_active,
+                    'current_daily_loss': self.current_daily_loss,
+                    'unresolved_events': sum(1 for e in self.emergency_events if not e.resolved),
+                    'total_events': len(self.emergency_events)
+                })
+                last_heartbeat = self.last_heartbeat
+                stop_file_present = self._stop_file_present
+            
+            # While the file watcher is running it has already checked the stop
+            # file this tick; otherwise nothing tracks it, so check it directly
+            if (status['monitoring_active'] and self._stop_file_check is not None
+                    and stop_file_present is not None):
+                status['emergency_stop_file_exists'] = stop_file_present
+            else:
+                status['emergency_stop_file_exists'] = os.path.exists(self.emergency_stop_file)
+            
+            status['last_heartbeat'] = last_heartbeat.isoformat()
+            return status
             
         except Exception as e:
             self.logger.error(f"Error getting emergency status: {e}")
@@ -580,7 +816,8 @@ class EmergencyController:
             List of emergency events
         """
         try:
-            events = self.emergency_events
+            with self._state_lock:
+                events = list(self.emergency_events)
             
             # Filter by resolved status
             if resolved is not None:
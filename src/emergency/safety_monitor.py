@@ -6,11 +6,17 @@ market hours validation, system resource monitoring, and automated safety action
 """
 
 import psutil
+import socket
 import threading
+import types
 import time
+import heapq
 import logging
-from datetime import datetime, time as dt_time
-from typing import Dict, Any, List, Optional, Callable
+from operator import attrgetter
+from collections import deque
+from itertools import count, takewhile
+from datetime import datetime, timedelta, time as dt_time
+from typing import Dict, Any, List, Optional, Callable, Deque, Mapping, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -28,7 +34,7 @@ class SafetyCheckType(Enum):
     RISK_THRESHOLDS = "risk_thresholds"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SafetyViolation:
     """Represents a safety violation"""
     check_type: SafetyCheckType
@@ -40,6 +46,24 @@ class SafetyViolation:
     metadata: Dict[str, Any]
 
 
+@dataclass(slots=True)
+class ResourceSample:
+    """Snapshot of system resource usage taken in one pass"""
+    cpu_percent: float
+    memory_percent: float
+    memory_available_gb: float
+    disk_free_gb: float
+    sampled_at: float  # monotonic seconds
+
+
+@dataclass(slots=True)
+class PositionAggregates:
+    """Position totals computed once per trading-state update"""
+    open_trade_ids: List[str]
+    total_value: float
+    oversized_positions: List[Tuple[Trade, float]]
+
+
 class SafetyMonitor:
     """
     Comprehensive safety monitoring system.
@@ -62,7 +86,10 @@ class SafetyMonitor:
         
         # Monitoring configuration
         self.check_interval = config.get('check_interval', 10)  # seconds
-        self.enabled_checks = config.get('enabled_checks', list(SafetyCheckType))
+        self.enabled_checks = tuple(
+            SafetyCheckType(check) if isinstance(check, str) else check
+            for check in config.get('enabled_checks', list(SafetyCheckType))
+        )
         
         # Position limits
         self.max_concurrent_positions = config.get('max_concurrent_positions', 5)
@@ -75,14 +102,27 @@ class SafetyMonitor:
         self.pre_market_buffer = config.get('pre_market_buffer', 15)  # minutes
         self.post_market_buffer = config.get('post_market_buffer', 15)  # minutes
         
+        # Extended market-hour boundaries, recomputed when the date changes
+        self._market_hours_date = None
+        self._extended_open: Optional[dt_time] = None
+        self._extended_close: Optional[dt_time] = None
+        self._last_weekend_warning_date = None
+        self._weekend_violation_key: Optional[Tuple] = None
+        
         # System resource limits
         self.max_cpu_usage = config.get('max_cpu_usage', 80.0)  # percentage
         self.max_memory_usage = config.get('max_memory_usage', 80.0)  # percentage
         self.min_disk_space = config.get('min_disk_space', 1.0)  # GB
         
+        # Prime psutil's CPU counters so later non-blocking samples measure
+        # usage since the previous call instead of sleeping for a window
+        psutil.cpu_percent(interval=None)
+        self._last_resource_sample: Optional[ResourceSample] = None
+        
         # Network and API health
         self.api_timeout_threshold = config.get('api_timeout_threshold', 30.0)  # seconds
         self.max_consecutive_api_failures = config.get('max_consecutive_api_failures', 5)
+        self.network_check_ttl = config.get('network_check_ttl', 30.0)  # seconds
         
         # Risk thresholds
         self.max_daily_loss_percentage = config.get('max_daily_loss_percentage', 0.8)  # 80% of limit
@@ -91,14 +131,45 @@ class SafetyMonitor:
         # Monitoring state
         self.monitoring_active = False
         self.monitor_thread: Optional[threading.Thread] = None
-        self.safety_violations: List[SafetyViolation] = []
+        self._stop_event = threading.Event()
+        
+        # Violation history is bounded; repeat detection keeps only the
+        # monotonic times of the latest violations of each check type
+        self.max_violation_history = config.get('max_violation_history', 10000)
+        self.safety_violations: Deque[SafetyViolation] = deque(maxlen=self.max_violation_history)
+        self._recent_per_type: Dict[SafetyCheckType, Deque[float]] = {
+            check_type: deque(maxlen=16) for check_type in SafetyCheckType
+        }
+        
+        # Persistent conditions are reported when they start and then at most
+        # once per repeat interval; key -> [last emit (monotonic), suppressed]
+        self.violation_repeat_interval = config.get('violation_repeat_interval', 60.0)  # seconds
+        self._active_violations: Dict[Tuple, List] = {}
+        self._tick_violation_keys: Set[Tuple] = set()
         
         # Current system state
-        self.active_trades: Dict[str, Trade] = {}
+        self.active_trades: Mapping[str, Trade] = types.MappingProxyType({})
+        self._position_aggregates = PositionAggregates([], 0.0, [])
         self.current_daily_pnl = 0.0
         self.peak_daily_pnl = 0.0
-        self.api_failure_count = 0
-        self.last_api_success = datetime.now()
+        # Failures are numbered by an itertools counter, whose next() is atomic
+        # under the GIL, so API threads never take a lock; a success records
+        # the current number as the new baseline
+        self._api_failure_seq = count(1)
+        self._api_failure_last = 0
+        self._api_failure_baseline = 0
+        self._last_api_success_mono = time.monotonic()
+        self._last_network_ok: Optional[float] = None  # monotonic seconds
+        
+        # Check type -> check method, resolved once
+        self._check_dispatch: Dict[SafetyCheckType, Callable[[datetime], None]] = {
+            SafetyCheckType.POSITION_LIMITS: self._check_position_limits,
+            SafetyCheckType.MARKET_HOURS: self._check_market_hours,
+            SafetyCheckType.SYSTEM_RESOURCES: self._check_system_resources,
+            SafetyCheckType.NETWORK_CONNECTIVITY: self._check_network_connectivity,
+            SafetyCheckType.API_HEALTH: self._check_api_health,
+            SafetyCheckType.RISK_THRESHOLDS: self._check_risk_thresholds
+        }
         
         # Safety action callbacks
         self.safety_callbacks: Dict[SafetyCheckType, List[Callable]] = {
@@ -120,6 +191,7 @@ class SafetyMonitor:
                 return True
             
             self.monitoring_active = True
+            self._stop_event.clear()
             self.monitor_thread = threading.Thread(
                 target=self._monitoring_loop,
                 daemon=True
@@ -137,6 +209,7 @@ class SafetyMonitor:
         """Stop safety monitoring"""
         try:
             self.monitoring_active = False
+            self._stop_event.set()
             
             if self.monitor_thread and self.monitor_thread.is_alive():
                 self.monitor_thread.join(timeout=10)
@@ -154,110 +227,104 @@ class SafetyMonitor:
         
         while self.monitoring_active:
             try:
+                # Single timestamp shared by every check in this tick
+                now = datetime.now()
+                
                 # Perform all enabled safety checks
                 for check_type in self.enabled_checks:
-                    if isinstance(check_type, str):
-                        check_type = SafetyCheckType(check_type)
-                    
-                    self._perform_safety_check(check_type)
+                    self._perform_safety_check(check_type, now)
                 
                 # Process any violations
                 self._process_safety_violations()
+                self._clear_resolved_violations()
                 
-                # Sleep until next check
-                time.sleep(self.check_interval)
+                # Sleep until next check, waking immediately on stop
+                if self._stop_event.wait(self.check_interval):
+                    break
                 
             except Exception as e:
-                self.logger.error(f"Error in safety monitoring loop: {e}")
-                time.sleep(5)  # Short sleep on error
+                self.logger.error("Error in safety monitoring loop: %s", e)
+                if self._stop_event.wait(5):  # Short sleep on error
+                    break
         
         self.logger.info("Safety monitoring loop ended")
     
-    def _perform_safety_check(self, check_type: SafetyCheckType) -> None:
+    def _perform_safety_check(self, check_type: SafetyCheckType, now: datetime) -> None:
         """Perform a specific safety check"""
         try:
-            if check_type == SafetyCheckType.POSITION_LIMITS:
-                self._check_position_limits()
-            elif check_type == SafetyCheckType.MARKET_HOURS:
-                self._check_market_hours()
-            elif check_type == SafetyCheckType.SYSTEM_RESOURCES:
-                self._check_system_resources()
-            elif check_type == SafetyCheckType.NETWORK_CONNECTIVITY:
-                self._check_network_connectivity()
-            elif check_type == SafetyCheckType.API_HEALTH:
-                self._check_api_health()
-            elif check_type == SafetyCheckType.RISK_THRESHOLDS:
-                self._check_risk_thresholds()
+            check = self._check_dispatch.get(check_type)
+            if check is not None:
+                check(now)
                 
         except Exception as e:
-            self.logger.error(f"Error performing safety check {check_type.value}: {e}")
+            self.logger.error("Error performing safety check %s: %s", check_type.value, e)
     
-    def _check_position_limits(self) -> None:
+    def _check_position_limits(self, now: datetime) -> None:
         """Check position-related safety limits"""
         try:
-            open_trades = [trade for trade in self.active_trades.values() 
-                          if trade.status == TradeStatus.OPEN]
+            # Totals are computed when the trading state is updated, so a
+            # tick only compares them against the limits
+            aggregates = self._position_aggregates
+            open_trade_ids = aggregates.open_trade_ids
+            total_position_value = aggregates.total_value
             
             # Check concurrent position limit
-            if len(open_trades) > self.max_concurrent_positions:
+            open_count = len(open_trade_ids)
+            if open_count > self.max_concurrent_positions:
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.POSITION_LIMITS,
                     severity=EmergencyLevel.HIGH,
-                    message=f"Too many concurrent positions: {len(open_trades)} > {self.max_concurrent_positions}",
-                    timestamp=datetime.now(),
-                    current_value=len(open_trades),
+                    message=f"Too many concurrent positions: {open_count} > {self.max_concurrent_positions}",
+                    timestamp=now,
+                    current_value=open_count,
                     threshold_value=self.max_concurrent_positions,
-                    metadata={'open_trades': [t.trade_id for t in open_trades]}
+                    metadata={'open_trades': open_trade_ids}
                 )
                 self._record_safety_violation(violation)
             
             # Check individual position sizes
-            for trade in open_trades:
-                position_value = abs(trade.current_pnl) + sum(
-                    leg.quantity * leg.current_price for leg in trade.legs
+            for trade, position_value in aggregates.oversized_positions:
+                violation = SafetyViolation(
+                    check_type=SafetyCheckType.POSITION_LIMITS,
+                    severity=EmergencyLevel.MEDIUM,
+                    message=f"Position size too large: {trade.trade_id} = ₹{position_value:,.2f}",
+                    timestamp=now,
+                    current_value=position_value,
+                    threshold_value=self.max_single_position_size,
+                    metadata={'trade_id': trade.trade_id, 'strategy': trade.strategy}
                 )
-                
-                if position_value > self.max_single_position_size:
-                    violation = SafetyViolation(
-                        check_type=SafetyCheckType.POSITION_LIMITS,
-                        severity=EmergencyLevel.MEDIUM,
-                        message=f"Position size too large: {trade.trade_id} = ₹{position_value:,.2f}",
-                        timestamp=datetime.now(),
-                        current_value=position_value,
-                        threshold_value=self.max_single_position_size,
-                        metadata={'trade_id': trade.trade_id, 'strategy': trade.strategy}
-                    )
-                    self._record_safety_violation(violation)
+                self._record_safety_violation(violation)
             
             # Check total position value
-            total_position_value = sum(
-                abs(trade.current_pnl) + sum(leg.quantity * leg.current_price for leg in trade.legs)
-                for trade in open_trades
-            )
-            
             if total_position_value > self.max_position_value:
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.POSITION_LIMITS,
                     severity=EmergencyLevel.HIGH,
                     message=f"Total position value too large: ₹{total_position_value:,.2f}",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     current_value=total_position_value,
                     threshold_value=self.max_position_value,
-                    metadata={'total_positions': len(open_trades)}
+                    metadata={'total_positions': open_count}
                 )
                 self._record_safety_violation(violation)
                 
         except Exception as e:
-            self.logger.error(f"Error checking position limits: {e}")
+            self.logger.error("Error checking position limits: %s", e)
     
-    def _check_market_hours(self) -> None:
+    def _check_market_hours(self, now: datetime) -> None:
         """Check if trading is within allowed market hours"""
         try:
-            now = datetime.now()
-            current_time = now.time()
-            
             # Check if it's a weekday (Monday=0, Sunday=6)
             if now.weekday() >= 5:  # Weekend
+                # The condition holds all day, so report it once per date but
+                # keep it active on later ticks so it is not logged as cleared
+                today = now.date()
+                if self._last_weekend_warning_date == today:
+                    if self._weekend_violation_key is not None:
+                        self._tick_violation_keys.add(self._weekend_violation_key)
+                    return
+                self._last_weekend_warning_date = today
+                
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.MARKET_HOURS,
                     severity=EmergencyLevel.MEDIUM,
@@ -267,14 +334,23 @@ class SafetyMonitor:
                     threshold_value=4,  # Friday
                     metadata={'day_name': now.strftime('%A')}
                 )
+                self._weekend_violation_key = self._violation_key(violation)
                 self._record_safety_violation(violation)
                 return
             
-            # Calculate extended market hours with buffers
-            extended_open = (datetime.combine(now.date(), self.market_open_time) - 
-                           timedelta(minutes=self.pre_market_buffer)).time()
-            extended_close = (datetime.combine(now.date(), self.market_close_time) + 
-                            timedelta(minutes=self.post_market_buffer)).time()
+            current_time = now.time()
+            
+            # Calculate extended market hours with buffers once per day
+            today = now.date()
+            if today != self._market_hours_date:
+                self._extended_open = (datetime.combine(today, self.market_open_time) - 
+                                       timedelta(minutes=self.pre_market_buffer)).time()
+                self._extended_close = (datetime.combine(today, self.market_close_time) + 
+                                        timedelta(minutes=self.post_market_buffer)).time()
+                self._market_hours_date = today
+            
+            extended_open = self._extended_open
+            extended_close = self._extended_close
             
             # Check if outside extended market hours
             if not (extended_open <= current_time <= extended_close):
@@ -293,19 +369,21 @@ class SafetyMonitor:
                 self._record_safety_violation(violation)
                 
         except Exception as e:
-            self.logger.error(f"Error checking market hours: {e}")
+            self.logger.error("Error checking market hours: %s", e)
     
-    def _check_system_resources(self) -> None:
+    def _check_system_resources(self, now: datetime) -> None:
         """Check system resource usage"""
         try:
-            # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            sample = self._sample_resources()
+            
+            # Check CPU usage (non-blocking, measured since the previous tick)
+            cpu_percent = sample.cpu_percent
             if cpu_percent > self.max_cpu_usage:
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.SYSTEM_RESOURCES,
                     severity=EmergencyLevel.MEDIUM,
                     message=f"High CPU usage: {cpu_percent:.1f}%",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     current_value=cpu_percent,
                     threshold_value=self.max_cpu_usage,
                     metadata={'resource_type': 'cpu'}
@@ -313,32 +391,30 @@ class SafetyMonitor:
                 self._record_safety_violation(violation)
             
             # Check memory usage
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
+            memory_percent = sample.memory_percent
             if memory_percent > self.max_memory_usage:
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.SYSTEM_RESOURCES,
                     severity=EmergencyLevel.MEDIUM,
                     message=f"High memory usage: {memory_percent:.1f}%",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     current_value=memory_percent,
                     threshold_value=self.max_memory_usage,
                     metadata={
                         'resource_type': 'memory',
-                        'available_gb': memory.available / (1024**3)
+                        'available_gb': sample.memory_available_gb
                     }
                 )
                 self._record_safety_violation(violation)
             
             # Check disk space
-            disk = psutil.disk_usage('/')
-            free_gb = disk.free / (1024**3)
+            free_gb = sample.disk_free_gb
             if free_gb < self.min_disk_space:
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.SYSTEM_RESOURCES,
                     severity=EmergencyLevel.HIGH,
                     message=f"Low disk space: {free_gb:.1f} GB",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     current_value=free_gb,
                     threshold_value=self.min_disk_space,
                     metadata={'resource_type': 'disk'}
@@ -346,29 +422,51 @@ class SafetyMonitor:
                 self._record_safety_violation(violation)
                 
         except Exception as e:
-            self.logger.error(f"Error checking system resources: {e}")
+            self.logger.error("Error checking system resources: %s", e)
+    
+    def _sample_resources(self) -> ResourceSample:
+        """Read CPU, memory and disk usage once and cache the snapshot"""
+        memory = psutil.virtual_memory()
+        sample = ResourceSample(
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_available_gb=memory.available / (1024**3),
+            disk_free_gb=psutil.disk_usage('/').free / (1024**3),
+            sampled_at=time.monotonic()
+        )
+        self._last_resource_sample = sample
+        return sample
     
-    def _check_network_connectivity(self) -> None:
+    def _check_network_connectivity(self, now: datetime) -> None:
         """Check network connectivity"""
         try:
-            import socket
+            # A recent successful API call already proves connectivity
+            if (self._last_network_ok is not None and
+                    time.monotonic() - self._last_network_ok < self.network_check_ttl):
+                return
             
-            # Test connectivity to a reliable host
+            # Test for a route to a reliable host; connecting a UDP socket
+            # only consults the kernel routing table and sends no packets
             test_host = "8.8.8.8"  # Google DNS
             test_port = 53
-            timeout = 5
             
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             
             try:
-                result = sock.connect_ex((test_host, test_port))
-                if result != 0:
+                try:
+                    sock.connect((test_host, test_port))
+                    result = 0
+                except OSError as e:
+                    result = e.errno or -1
+                
+                if result == 0:
+                    self._last_network_ok = time.monotonic()
+                else:
                     violation = SafetyViolation(
                         check_type=SafetyCheckType.NETWORK_CONNECTIVITY,
                         severity=EmergencyLevel.HIGH,
                         message=f"Network connectivity test failed to {test_host}:{test_port}",
-                        timestamp=datetime.now(),
+                        timestamp=now,
                         current_value=result,
                         threshold_value=0,
                         metadata={'test_host': test_host, 'test_port': test_port}
@@ -378,42 +476,47 @@ class SafetyMonitor:
                 sock.close()
                 
         except Exception as e:
-            self.logger.error(f"Error checking network connectivity: {e}")
+            self.logger.error("Error checking network connectivity: %s", e)
     
-    def _check_api_health(self) -> None:
+    def _check_api_health(self, now: datetime) -> None:
         """Check API health and responsiveness"""
         try:
             # Check consecutive API failures
-            if self.api_failure_count >= self.max_consecutive_api_failures:
+            failure_count = self.api_failure_count
+            if failure_count >= self.max_consecutive_api_failures:
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.API_HEALTH,
                     severity=EmergencyLevel.CRITICAL,
-                    message=f"Too many consecutive API failures: {self.api_failure_count}",
-                    timestamp=datetime.now(),
-                    current_value=self.api_failure_count,
+                    message=f"Too many consecutive API failures: {failure_count}",
+                    timestamp=now,
+                    current_value=failure_count,
                     threshold_value=self.max_consecutive_api_failures,
-                    metadata={'last_success': self.last_api_success.isoformat()}
+                    metadata={'last_success': self._last_api_success_time().isoformat()}
                 )
                 self._record_safety_violation(violation)
             
             # Check time since last successful API call
-            time_since_success = (datetime.now() - self.last_api_success).total_seconds()
+            time_since_success = time.monotonic() - self._last_api_success_mono
             if time_since_success > self.api_timeout_threshold:
                 violation = SafetyViolation(
                     check_type=SafetyCheckType.API_HEALTH,
                     severity=EmergencyLevel.HIGH,
                     message=f"No successful API calls for {time_since_success:.1f}s",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     current_value=time_since_success,
                     threshold_value=self.api_timeout_threshold,
-                    metadata={'last_success': self.last_api_success.isoformat()}
+                    metadata={'last_success': self._last_api_success_time().isoformat()}
                 )
                 self._record_safety_violation(violation)
                 
         except Exception as e:
-            self.logger.error(f"Error checking API health: {e}")
+            self.logger.error("Error checking API health: %s", e)
+    
+    def _last_api_success_time(self) -> datetime:
+        """Wall-clock time of the last successful API call, for reporting"""
+        return datetime.now() - timedelta(seconds=time.monotonic() - self._last_api_success_mono)
     
-    def _check_risk_thresholds(self) -> None:
+    def _check_risk_thresholds(self, now: datetime) -> None:
         """Check risk-related thresholds"""
         try:
             # Check daily loss percentage
@@ -425,7 +528,7 @@ class SafetyMonitor:
                     check_type=SafetyCheckType.RISK_THRESHOLDS,
                     severity=EmergencyLevel.HIGH,
                     message=f"Daily loss approaching limit: ₹{abs(self.current_daily_pnl):,.2f} / ₹{daily_loss_limit:,.2f}",
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     current_value=abs(self.current_daily_pnl),
                     threshold_value=daily_loss_threshold,
                     metadata={'daily_loss_limit': daily_loss_limit}
@@ -441,7 +544,7 @@ class SafetyMonitor:
                         check_type=SafetyCheckType.RISK_THRESHOLDS,
                         severity=EmergencyLevel.MEDIUM,
                         message=f"High drawdown from peak: {current_drawdown:.1%}",
-                        timestamp=datetime.now(),
+                        timestamp=now,
                         current_value=current_drawdown,
                         threshold_value=self.max_drawdown_percentage,
                         metadata={
@@ -452,62 +555,96 @@ class SafetyMonitor:
                     self._record_safety_violation(violation)
                     
         except Exception as e:
-            self.logger.error(f"Error checking risk thresholds: {e}")
+            self.logger.error("Error checking risk thresholds: %s", e)
     
     def _record_safety_violation(self, violation: SafetyViolation) -> None:
         """Record a safety violation and trigger appropriate actions"""
         try:
+            key = self._violation_key(violation)
+            self._tick_violation_keys.add(key)
+            
+            now_mono = time.monotonic()
+            state = self._active_violations.get(key)
+            if state is not None:
+                if now_mono - state[0] < self.violation_repeat_interval:
+                    state[1] += 1
+                    return
+                if state[1]:
+                    violation.metadata['suppressed_repeats'] = state[1]
+            self._active_violations[key] = [now_mono, 0]
+            
             self.safety_violations.append(violation)
+            self._recent_per_type[violation.check_type].append(now_mono)
             
-            self.logger.warning(f"SAFETY VIOLATION: {violation.check_type.value} - {violation.message}")
+            self.logger.warning("SAFETY VIOLATION: %s - %s", violation.check_type.value, violation.message)
             
-            # Execute callbacks for this violation type
-            callbacks = self.safety_callbacks.get(violation.check_type, [])
-            for callback in callbacks:
+            # Execute callbacks for this violation type (every type is keyed
+            # at init; iterate a snapshot in case a callback registers another)
+            for callback in tuple(self.safety_callbacks[violation.check_type]):
                 try:
                     callback(violation)
                 except Exception as e:
-                    self.logger.error(f"Error executing safety callback: {e}")
+                    self.logger.error("Error executing safety callback: %s", e)
             
             # For critical violations, trigger emergency event
-            if violation.severity == EmergencyLevel.CRITICAL:
-                emergency_event = EmergencyEvent(
-                    event_type=EmergencyType.SYSTEM_ERROR,
-                    level=violation.severity,
-                    message=f"Safety violation: {violation.message}",
-                    timestamp=violation.timestamp,
-                    source="safety_monitor",
-                    metadata=violation.metadata
-                )
-                
-                self.emergency_controller._trigger_emergency_event(emergency_event)
+            if violation.severity is EmergencyLevel.CRITICAL:
+                self._escalate_to_emergency(violation)
                 
         except Exception as e:
-            self.logger.error(f"Error recording safety violation: {e}")
+            self.logger.error("Error recording safety violation: %s", e)
+    
+    def _escalate_to_emergency(self, violation: SafetyViolation) -> None:
+        """Raise a critical safety violation with the emergency controller"""
+        emergency_event = EmergencyEvent(
+            event_type=EmergencyType.SYSTEM_ERROR,
+            level=violation.severity,
+            message=f"Safety violation: {violation.message}",
+            timestamp=violation.timestamp,
+            source="safety_monitor",
+            metadata=violation.metadata
+        )
+        
+        self.emergency_controller._trigger_emergency_event(emergency_event)
+    
+    @staticmethod
+    def _violation_key(violation: SafetyViolation) -> Tuple:
+        """Identify the condition a violation reports, independent of its current value"""
+        metadata = violation.metadata
+        subject = metadata.get('trade_id') or metadata.get('resource_type')
+        return (violation.check_type, violation.severity, violation.threshold_value, subject)
+    
+    def _clear_resolved_violations(self) -> None:
+        """Forget conditions that were not reported this tick so they re-alert if they return"""
+        resolved = [key for key in self._active_violations if key not in self._tick_violation_keys]
+        for key in resolved:
+            suppressed = self._active_violations.pop(key)[1]
+            self.logger.info("Safety condition cleared: %s (%d repeats suppressed)",
+                             key[0].value, suppressed)
+        self._tick_violation_keys.clear()
     
     def _process_safety_violations(self) -> None:
         """Process recent safety violations and take automated actions"""
         try:
-            # Get recent violations (last 5 minutes)
-            recent_time = datetime.now() - timedelta(minutes=5)
-            recent_violations = [v for v in self.safety_violations 
-                               if v.timestamp > recent_time]
-            
-            # Group violations by type
-            violation_counts = {}
-            for violation in recent_violations:
-                violation_counts[violation.check_type] = violation_counts.get(violation.check_type, 0) + 1
-            
-            # Take action on repeated violations
-            for check_type, count in violation_counts.items():
-                if count >= 3:  # 3 violations in 5 minutes
-                    self.logger.warning(f"Repeated safety violations: {check_type.value} ({count} times)")
+            # Drop timestamps older than 5 minutes; each ring is appended in
+            # time order so only the head can expire
+            recent_time = time.monotonic() - 300
+            report = self.logger.isEnabledFor(logging.WARNING)
+            
+            for check_type, timestamps in self._recent_per_type.items():
+                while timestamps and timestamps[0] <= recent_time:
+                    timestamps.popleft()
+                
+                # Take action on repeated violations (only reported for now)
+                violation_count = len(timestamps)
+                if report and violation_count >= 3:  # 3 violations in 5 minutes
+                    self.logger.warning("Repeated safety violations: %s (%d times)",
+                                        check_type.value, violation_count)
                     
                     # Could implement automated remediation actions here
                     # For example, reducing position sizes, pausing trading, etc.
                     
         except Exception as e:
-            self.logger.error(f"Error processing safety violations: {e}")
+            self.logger.error("Error processing safety violations: %s", e)
     
     def register_safety_callback(self, check_type: SafetyCheckType, 
                                callback: Callable[[SafetyViolation], None]) -> None:
@@ -518,9 +655,6 @@ class SafetyMonitor:
             check_type: Type of safety check
             callback: Callback function to execute
         """
-        if check_type not in self.safety_callbacks:
-            self.safety_callbacks[check_type] = []
-        
         self.safety_callbacks[check_type].append(callback)
         self.logger.info(f"Registered safety callback for {check_type.value}")
     
@@ -528,25 +662,68 @@ class SafetyMonitor:
         """
         Update current trading state for monitoring.
         
+        The monitor keeps a read-only view of the caller's dictionary rather
+        than a copy; the caller owns the dictionary and any mutation of it is
+        visible here. Position totals used by the limit checks are computed
+        here, so they reflect the trades as of the latest update.
+        
         Args:
             trades: Dictionary of active trades
             daily_pnl: Current daily P&L
         """
-        self.active_trades = trades.copy()
+        if not isinstance(trades, types.MappingProxyType):
+            trades = types.MappingProxyType(trades)
+        self._position_aggregates = self._compute_position_aggregates(trades)
+        self.active_trades = trades
         self.current_daily_pnl = daily_pnl
         
         # Update peak P&L
         if daily_pnl > self.peak_daily_pnl:
             self.peak_daily_pnl = daily_pnl
     
+    def _compute_position_aggregates(self, trades: Mapping[str, Trade]) -> PositionAggregates:
+        """Value each open position once and accumulate the portfolio total"""
+        open_trade_ids = []
+        oversized_positions = []
+        total_position_value = 0.0
+        
+        # Snapshot the values: the caller owns the dict and may mutate it
+        for trade in tuple(trades.values()):
+            if trade.status is not TradeStatus.OPEN:
+                continue
+            open_trade_ids.append(trade.trade_id)
+            
+            unrealized_pnl = 0.0
+            legs_value = 0.0
+            for leg in trade.legs:
+                unrealized_pnl += leg.unrealized_pnl
+                legs_value += leg.quantity * leg.current_price
+            
+            position_value = abs(unrealized_pnl) + legs_value
+            total_position_value += position_value
+            
+            if position_value > self.max_single_position_size:
+                oversized_positions.append((trade, position_value))
+        
+        return PositionAggregates(open_trade_ids, total_position_value, oversized_positions)
+    
     def record_api_success(self) -> None:
         """Record successful API call"""
-        self.last_api_success = datetime.now()
-        self.api_failure_count = 0
+        # Monotonic floats are cheap to read and immune to clock changes;
+        # wall-clock time is derived only when reporting
+        now_mono = time.monotonic()
+        self._last_api_success_mono = now_mono
+        self._last_network_ok = now_mono
+        self._api_failure_baseline = self._api_failure_last
     
     def record_api_failure(self) -> None:
         """Record failed API call"""
-        self.api_failure_count += 1
+        self._api_failure_last = next(self._api_failure_seq)
+    
+    @property
+    def api_failure_count(self) -> int:
+        """Consecutive API failures since the last success"""
+        return max(self._api_failure_last - self._api_failure_baseline, 0)
     
     def get_safety_status(self) -> Dict[str, Any]:
         """
@@ -556,23 +733,33 @@ class SafetyMonitor:
             Dictionary with safety status information
         """
         try:
-            recent_violations = [v for v in self.safety_violations 
-                               if v.timestamp > datetime.now() - timedelta(hours=1)]
+            # While monitoring, only the monitor thread samples: each
+            # cpu_percent() call resets the baseline its next reading is
+            # measured from. Without a monitor, a fresh sample is harmless.
+            sample = self._last_resource_sample
+            if not self.monitoring_active and (
+                    sample is None or time.monotonic() - sample.sampled_at > 2 * self.check_interval):
+                sample = self._sample_resources()
+            
+            # Walk back from the newest violation until one is older than an hour
+            recent_time = datetime.now() - timedelta(hours=1)
+            recent_count = sum(1 for _ in takewhile(lambda v: v.timestamp > recent_time,
+                                                    reversed(self.safety_violations)))
             
             return {
                 'monitoring_active': self.monitoring_active,
                 'enabled_checks': [check.value for check in self.enabled_checks],
-                'recent_violations': len(recent_violations),
+                'recent_violations': recent_count,
                 'total_violations': len(self.safety_violations),
                 'api_failure_count': self.api_failure_count,
-                'last_api_success': self.last_api_success.isoformat(),
+                'last_api_success': self._last_api_success_time().isoformat(),
                 'current_daily_pnl': self.current_daily_pnl,
                 'peak_daily_pnl': self.peak_daily_pnl,
                 'active_positions': len(self.active_trades),
                 'system_resources': {
-                    'cpu_percent': psutil.cpu_percent(),
-                    'memory_percent': psutil.virtual_memory().percent,
-                    'disk_free_gb': psutil.disk_usage('/').free / (1024**3)
+                    'cpu_percent': sample.cpu_percent if sample else None,
+                    'memory_percent': sample.memory_percent if sample else None,
+                    'disk_free_gb': sample.disk_free_gb if sample else None
                 }
             }
             
@@ -595,18 +782,20 @@ class SafetyMonitor:
         try:
             violations = self.safety_violations
             
-            # Filter by check type
-            if check_type:
-                violations = [v for v in violations if v.check_type == check_type]
-            
-            # Sort by timestamp (newest first)
-            violations = sorted(violations, key=lambda v: v.timestamp, reverse=True)
+            # History is appended in time order, so newest-first is just the
+            # tail read backwards; index from the right since the monitor
+            # thread may append concurrently
+            if not check_type:
+                count = min(limit, len(violations)) if limit else len(violations)
+                return [violations[-i] for i in range(1, count + 1)]
             
-            # Apply limit
+            # Filter by check type, then take the newest (bounded by limit)
+            matching = (v for v in tuple(violations) if v.check_type is check_type)
+            by_timestamp = attrgetter('timestamp')
             if limit:
-                violations = violations[:limit]
+                return heapq.nlargest(limit, matching, key=by_timestamp)
             
-            return violations
+            return sorted(matching, key=by_timestamp, reverse=True)
             
         except Exception as e:
             self.logger.error(f"Error getting safety violations: {e}")
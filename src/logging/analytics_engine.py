@@ -8,17 +8,32 @@ drawdown analysis, and other key trading metrics.
 import csv
 import json
 import math
-from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from functools import lru_cache
+from operator import itemgetter
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from pathlib import Path
 from dataclasses import dataclass
 
 from ..models.trading_models import Trade
 
 
-@dataclass
+# Ledger columns the metrics read; the rest of each row is never materialized
+LEDGER_COLUMNS = ('strategy', 'status', 'entry_time', 'total_pnl', 'holding_period_minutes')
+
+# PerformanceMetrics fields rounded to 2 decimals, in the order _build_metrics computes them
+ROUNDED_METRIC_FIELDS = (
+    'win_rate', 'total_pnl', 'average_win', 'average_loss', 'profit_factor',
+    'max_drawdown', 'max_drawdown_percent', 'sharpe_ratio', 'calmar_ratio',
+    'total_return', 'annualized_return', 'volatility', 'average_holding_period',
+    'best_trade', 'worst_trade', 'expectancy'
+)
+
+
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
-    """Container for performance metrics."""
+    """Container for performance metrics (immutable, so memoized results can be shared)."""
     total_trades: int
     winning_trades: int
     losing_trades: int
@@ -54,14 +69,30 @@ class AnalyticsEngine:
     - Time-based performance analysis
     """
     
-    def __init__(self, trade_ledger_path: Path):
+    def __init__(self, trade_ledger_path: Path,
+                 flush_ledger: Optional[Callable[[], None]] = None):
         """
         Initialize the analytics engine.
         
         Args:
             trade_ledger_path: Path to the trade ledger CSV file
+            flush_ledger: Called before the ledger is read, e.g. TradeReporter.flush,
+                so rows still buffered by the writer are on disk
         """
         self.trade_ledger_path = trade_ledger_path
+        self._flush_ledger = flush_ledger
+        
+        # Parsed ledger rows, reused until the file changes on disk
+        self._ledger_cache: Optional[Tuple[Tuple[int, int], List[Tuple[str, Dict[str, Any]]]]] = None
+        
+        # Metrics per (date range, strategy, capital, ledger version); a new
+        # ledger version makes older entries unreachable
+        self._cached_metrics = lru_cache(maxsize=128)(self._compute_performance_metrics)
+    
+    def clear_cache(self) -> None:
+        """Drop the parsed ledger and memoized metrics so the next calculation re-reads the file."""
+        self._ledger_cache = None
+        self._cached_metrics.cache_clear()
     
     def calculate_performance_metrics(self, 
                                     start_date: Optional[date] = None,
@@ -80,8 +111,23 @@ class AnalyticsEngine:
         Returns:
             PerformanceMetrics object with all calculated metrics
         """
+        return self._cached_metrics(start_date, end_date, strategy, initial_capital,
+                                    self._ledger_version())
+    
+    def _compute_performance_metrics(self, start_date: Optional[date],
+                                     end_date: Optional[date],
+                                     strategy: Optional[str],
+                                     initial_capital: float,
+                                     ledger_version: Optional[Tuple[int, int]]) -> PerformanceMetrics:
+        """Load and calculate metrics; ledger_version only keys the memoization."""
         trades_data = self._load_trades_data(start_date, end_date, strategy)
-        
+        return self._build_metrics(trades_data, start_date, end_date, initial_capital)
+    
+    def _build_metrics(self, trades_data: List[Dict[str, Any]],
+                       start_date: Optional[date],
+                       end_date: Optional[date],
+                       initial_capital: float = 100000) -> PerformanceMetrics:
+        """Calculate full performance metrics for already-filtered trade records."""
         if not trades_data:
             return self._empty_metrics()
         
@@ -92,29 +138,31 @@ class AnalyticsEngine:
         if not completed_trades:
             return self._empty_metrics()
         
-        # P&L calculations
-        pnl_values = [float(t['total_pnl']) for t in completed_trades if t['total_pnl']]
-        winning_trades = [pnl for pnl in pnl_values if pnl > 0]
-        losing_trades = [pnl for pnl in pnl_values if pnl < 0]
+        # P&L calculations on a float64 array, filled straight from the rows
+        # without an intermediate list
+        pnl_values = np.fromiter((t['pnl'] for t in completed_trades if t['pnl'] is not None),
+                                 dtype=np.float64)
+        (winning_trades, losing_trades, total_pnl, gross_profit, gross_loss,
+         best_trade, worst_trade) = self._summarize_pnl(pnl_values)
         
         # Basic metrics
-        win_rate = (len(winning_trades) / len(completed_trades)) * 100 if completed_trades else 0
-        total_pnl = sum(pnl_values)
-        average_win = sum(winning_trades) / len(winning_trades) if winning_trades else 0
-        average_loss = sum(losing_trades) / len(losing_trades) if losing_trades else 0
-        profit_factor = abs(sum(winning_trades) / sum(losing_trades)) if losing_trades else float('inf')
+        win_rate = (winning_trades / len(completed_trades)) * 100 if completed_trades else 0
+        average_win = gross_profit / winning_trades if winning_trades else 0
+        average_loss = gross_loss / losing_trades if losing_trades else 0
+        profit_factor = abs(gross_profit / gross_loss) if losing_trades else float('inf')
         
         # Drawdown analysis
         max_drawdown, max_drawdown_percent = self._calculate_drawdown(pnl_values, initial_capital)
         
-        # Risk-adjusted metrics
-        sharpe_ratio = self._calculate_sharpe_ratio(pnl_values)
+        # Risk-adjusted metrics (mean and standard deviation are computed
+        # once and shared by the Sharpe ratio and volatility)
+        avg_return, volatility = self._calculate_return_moments(pnl_values)
+        sharpe_ratio = self._sharpe_from_moments(avg_return, volatility)
         calmar_ratio = self._calculate_calmar_ratio(total_pnl, max_drawdown_percent, len(completed_trades))
         
         # Return calculations
         total_return = (total_pnl / initial_capital) * 100
         annualized_return = self._calculate_annualized_return(total_return, start_date, end_date)
-        volatility = self._calculate_volatility(pnl_values)
         
         # Consecutive wins/losses
         max_consecutive_wins, max_consecutive_losses = self._calculate_consecutive_streaks(pnl_values)
@@ -122,35 +170,24 @@ class AnalyticsEngine:
         # Holding period analysis
         average_holding_period = self._calculate_average_holding_period(completed_trades)
         
-        # Best and worst trades
-        best_trade = max(pnl_values) if pnl_values else 0
-        worst_trade = min(pnl_values) if pnl_values else 0
-        
         # Expectancy
         expectancy = (win_rate / 100 * average_win) + ((100 - win_rate) / 100 * average_loss)
         
+        # Round every monetary and ratio field to 2 decimals in one step
+        rounded = np.round(np.array([
+            win_rate, total_pnl, average_win, average_loss, profit_factor,
+            max_drawdown, max_drawdown_percent, sharpe_ratio, calmar_ratio,
+            total_return, annualized_return, volatility, average_holding_period,
+            best_trade, worst_trade, expectancy
+        ], dtype=np.float64), 2).tolist()
+        
         return PerformanceMetrics(
             total_trades=total_trades,
-            winning_trades=len(winning_trades),
-            losing_trades=len(losing_trades),
-            win_rate=round(win_rate, 2),
-            total_pnl=round(total_pnl, 2),
-            average_win=round(average_win, 2),
-            average_loss=round(average_loss, 2),
-            profit_factor=round(profit_factor, 2),
-            max_drawdown=round(max_drawdown, 2),
-            max_drawdown_percent=round(max_drawdown_percent, 2),
-            sharpe_ratio=round(sharpe_ratio, 2),
-            calmar_ratio=round(calmar_ratio, 2),
-            total_return=round(total_return, 2),
-            annualized_return=round(annualized_return, 2),
-            volatility=round(volatility, 2),
+            winning_trades=winning_trades,
+            losing_trades=losing_trades,
             max_consecutive_wins=max_consecutive_wins,
             max_consecutive_losses=max_consecutive_losses,
-            average_holding_period=round(average_holding_period, 2),
-            best_trade=round(best_trade, 2),
-            worst_trade=round(worst_trade, 2),
-            expectancy=round(expectancy, 2)
+            **dict(zip(ROUNDED_METRIC_FIELDS, rounded))
         )
     
     def calculate_strategy_comparison(self, 
@@ -166,21 +203,27 @@ class AnalyticsEngine:
         Returns:
             Dictionary mapping strategy names to their performance metrics
         """
-        trades_data = self._load_trades_data(start_date, end_date)
+        # Group trades by strategy while filtering the cached ledger, so the
+        # rows are visited once
+        start_day = start_date.isoformat() if start_date else None
+        end_day = end_date.isoformat() if end_date else None
         
-        # Group trades by strategy
         strategy_trades = {}
-        for trade in trades_data:
-            strategy = trade['strategy']
-            if strategy not in strategy_trades:
-                strategy_trades[strategy] = []
-            strategy_trades[strategy].append(trade)
+        for entry_day, trade in self._read_ledger():
+            if start_day and entry_day < start_day:
+                continue
+            if end_day and entry_day > end_day:
+                continue
+            
+            trades = strategy_trades.get(trade['strategy'])
+            if trades is None:
+                trades = strategy_trades[trade['strategy']] = []
+            trades.append(trade)
         
         # Calculate metrics for each strategy
         strategy_metrics = {}
         for strategy, trades in strategy_trades.items():
-            # Create temporary CSV data for this strategy
-            strategy_metrics[strategy] = self._calculate_metrics_from_trades(trades)
+            strategy_metrics[strategy] = self._build_metrics(trades, start_date, end_date)
         
         return strategy_metrics
     
@@ -196,14 +239,21 @@ class AnalyticsEngine:
         """
         monthly_data = {}
         
-        for month in range(1, 13):
+        # Bucket the year's trades by month in one pass over the ledger
+        year_prefix = f"{year:04d}-"
+        month_trades = {month: [] for month in range(1, 13)}
+        for entry_day, row in self._read_ledger():
+            if entry_day.startswith(year_prefix):
+                month_trades[int(entry_day[5:7])].append(row)
+        
+        for month, trades in month_trades.items():
             start_date = date(year, month, 1)
             if month == 12:
                 end_date = date(year + 1, 1, 1) - timedelta(days=1)
             else:
                 end_date = date(year, month + 1, 1) - timedelta(days=1)
             
-            metrics = self.calculate_performance_metrics(start_date, end_date)
+            metrics = self._build_metrics(trades, start_date, end_date)
             monthly_data[f"{year}-{month:02d}"] = {
                 'total_trades': metrics.total_trades,
                 'win_rate': metrics.win_rate,
@@ -220,118 +270,149 @@ class AnalyticsEngine:
         """Load and filter trades data from CSV."""
         trades_data = []
         
-        if not self.trade_ledger_path.exists():
-            return trades_data
+        # ISO dates order the same as strings, so compare the cached
+        # 'YYYY-MM-DD' entry days directly
+        start_day = start_date.isoformat() if start_date else None
+        end_day = end_date.isoformat() if end_date else None
+        
+        for entry_day, row in self._read_ledger():
+            # Apply filters
+            if strategy and row['strategy'] != strategy:
+                continue
+            if start_day and entry_day < start_day:
+                continue
+            if end_day and entry_day > end_day:
+                continue
+            
+            trades_data.append(row)
+        
+        return trades_data
+    
+    def _read_ledger(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse the ledger into (entry day, row) pairs, cached per file version.
+        
+        The entry day is the 'YYYY-MM-DD' prefix of the ISO entry time, which
+        TradeReporter writes with isoformat(); rows without a valid entry
+        date are dropped. Each row's P&L is parsed
+        once into row['pnl'] (None when missing or malformed). The cache is
+        keyed on the file's modification time and size, so a ledger that has
+        been appended to is parsed again on the next call.
+        """
+        version = self._ledger_version()
+        if version is None:
+            self._ledger_cache = None
+            return []
+        
+        if self._ledger_cache is not None and self._ledger_cache[0] == version:
+            return self._ledger_cache[1]
+        
+        ledger_rows = []
         
         with open(self.trade_ledger_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Apply filters
-                if strategy and row['strategy'] != strategy:
-                    continue
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return ledger_rows
+            
+            # Pull only the needed columns out of each raw row instead of
+            # building a dict of every ledger field
+            select_columns = itemgetter(*(header.index(column) for column in LEDGER_COLUMNS))
+            
+            for values in reader:
+                try:
+                    row = dict(zip(LEDGER_COLUMNS, select_columns(values)))
+                except IndexError:
+                    continue  # Blank or truncated line
                 
-                # Date filtering
                 if row['entry_time']:
+                    entry_day = row['entry_time'][:10]
                     try:
-                        entry_date = datetime.fromisoformat(row['entry_time']).date()
-                        
-                        if start_date and entry_date < start_date:
-                            continue
-                        if end_date and entry_date > end_date:
-                            continue
-                        
-                        trades_data.append(row)
+                        date.fromisoformat(entry_day)
                     except ValueError:
                         continue
+                    
+                    try:
+                        row['pnl'] = float(row['total_pnl']) if row['total_pnl'] else None
+                    except ValueError:
+                        row['pnl'] = None
+                    
+                    ledger_rows.append((entry_day, row))
         
-        return trades_data
+        self._ledger_cache = (version, ledger_rows)
+        return ledger_rows
     
-    def _calculate_metrics_from_trades(self, trades_data: List[Dict[str, Any]]) -> PerformanceMetrics:
-        """Calculate metrics from a list of trade records."""
-        if not trades_data:
-            return self._empty_metrics()
+    def _ledger_version(self) -> Optional[Tuple[int, int]]:
+        """Identify the current ledger file contents by modification time and size."""
+        if self._flush_ledger is not None:
+            self._flush_ledger()
         
-        completed_trades = [t for t in trades_data if t['status'] == 'CLOSED']
+        try:
+            stat = self.trade_ledger_path.stat()
+        except FileNotFoundError:
+            return None
         
-        if not completed_trades:
-            return self._empty_metrics()
-        
-        pnl_values = [float(t['total_pnl']) for t in completed_trades if t['total_pnl']]
-        winning_trades = [pnl for pnl in pnl_values if pnl > 0]
-        losing_trades = [pnl for pnl in pnl_values if pnl < 0]
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _summarize_pnl(self, pnl_values: np.ndarray) -> Tuple[int, int, float, float, float, float, float]:
+        """
+        Reduce a P&L array to the scalar statistics every metric needs.
         
-        # Calculate all metrics (simplified version)
-        win_rate = (len(winning_trades) / len(completed_trades)) * 100 if completed_trades else 0
-        total_pnl = sum(pnl_values)
-        average_win = sum(winning_trades) / len(winning_trades) if winning_trades else 0
-        average_loss = sum(losing_trades) / len(losing_trades) if losing_trades else 0
-        profit_factor = abs(sum(winning_trades) / sum(losing_trades)) if losing_trades else float('inf')
+        Each statistic is computed once and shared, so averages and the
+        profit factor are derived from the same sums instead of re-reducing
+        the win and loss subsets.
         
-        return PerformanceMetrics(
-            total_trades=len(trades_data),
-            winning_trades=len(winning_trades),
-            losing_trades=len(losing_trades),
-            win_rate=round(win_rate, 2),
-            total_pnl=round(total_pnl, 2),
-            average_win=round(average_win, 2),
-            average_loss=round(average_loss, 2),
-            profit_factor=round(profit_factor, 2),
-            max_drawdown=0,  # Simplified
-            max_drawdown_percent=0,
-            sharpe_ratio=0,
-            calmar_ratio=0,
-            total_return=0,
-            annualized_return=0,
-            volatility=0,
-            max_consecutive_wins=0,
-            max_consecutive_losses=0,
-            average_holding_period=0,
-            best_trade=max(pnl_values) if pnl_values else 0,
-            worst_trade=min(pnl_values) if pnl_values else 0,
-            expectancy=0
+        Returns:
+            Tuple of (winning trades, losing trades, total P&L, gross profit,
+            gross loss, best trade, worst trade)
+        """
+        if not pnl_values.size:
+            return 0, 0, 0.0, 0.0, 0.0, 0, 0
+        
+        wins = pnl_values > 0
+        losses = pnl_values < 0
+        
+        return (
+            int(np.count_nonzero(wins)),
+            int(np.count_nonzero(losses)),
+            float(pnl_values.sum()),
+            float(pnl_values[wins].sum()),
+            float(pnl_values[losses].sum()),
+            float(pnl_values.max()),
+            float(pnl_values.min())
         )
     
     def _calculate_drawdown(self, pnl_values: List[float], 
                           initial_capital: float) -> Tuple[float, float]:
         """Calculate maximum drawdown in absolute and percentage terms."""
-        if not pnl_values:
+        if len(pnl_values) == 0:
             return 0, 0
         
-        cumulative_pnl = []
-        running_total = initial_capital
-        
-        for pnl in pnl_values:
-            running_total += pnl
-            cumulative_pnl.append(running_total)
+        # Equity curve starting from the initial capital, its running peak,
+        # and the drawdown from that peak at every trade
+        equity = np.cumsum(np.concatenate(([initial_capital], np.asarray(pnl_values, dtype=np.float64))))
+        peaks = np.maximum.accumulate(equity)[1:]
+        drawdowns = peaks - equity[1:]
         
-        peak = initial_capital
-        max_drawdown = 0
-        max_drawdown_percent = 0
+        worst = int(drawdowns.argmax())
+        max_drawdown = float(drawdowns[worst])
+        if max_drawdown <= 0:
+            return 0, 0
         
-        for value in cumulative_pnl:
-            if value > peak:
-                peak = value
-            
-            drawdown = peak - value
-            drawdown_percent = (drawdown / peak) * 100 if peak > 0 else 0
-            
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-                max_drawdown_percent = drawdown_percent
+        peak = float(peaks[worst])
+        max_drawdown_percent = (max_drawdown / peak) * 100 if peak > 0 else 0
         
         return max_drawdown, max_drawdown_percent
     
     def _calculate_sharpe_ratio(self, pnl_values: List[float], 
                                risk_free_rate: float = 0.05) -> float:
         """Calculate Sharpe ratio."""
-        if len(pnl_values) < 2:
-            return 0
-        
-        # Calculate average return and standard deviation
-        avg_return = sum(pnl_values) / len(pnl_values)
-        variance = sum((x - avg_return) ** 2 for x in pnl_values) / (len(pnl_values) - 1)
-        std_dev = math.sqrt(variance)
-        
+        avg_return, std_dev = self._calculate_return_moments(pnl_values)
+        return self._sharpe_from_moments(avg_return, std_dev, risk_free_rate)
+    
+    def _sharpe_from_moments(self, avg_return: float, std_dev: float,
+                             risk_free_rate: float = 0.05) -> float:
+        """Calculate Sharpe ratio from the mean and standard deviation of returns."""
         if std_dev == 0:
             return 0
         
@@ -369,36 +450,34 @@ class AnalyticsEngine:
     
     def _calculate_volatility(self, pnl_values: List[float]) -> float:
         """Calculate volatility (standard deviation of returns)."""
+        return self._calculate_return_moments(pnl_values)[1]
+    
+    def _calculate_return_moments(self, pnl_values: List[float]) -> Tuple[float, float]:
+        """Calculate mean and sample standard deviation of returns together."""
         if len(pnl_values) < 2:
-            return 0
+            return 0, 0
         
-        avg_return = sum(pnl_values) / len(pnl_values)
-        variance = sum((x - avg_return) ** 2 for x in pnl_values) / (len(pnl_values) - 1)
+        pnl = np.asarray(pnl_values, dtype=np.float64)
+        avg_return = float(pnl.mean())
+        variance = float(np.square(pnl - avg_return).sum()) / (pnl.size - 1)
         
-        return math.sqrt(variance)
+        return avg_return, math.sqrt(variance)
     
     def _calculate_consecutive_streaks(self, pnl_values: List[float]) -> Tuple[int, int]:
         """Calculate maximum consecutive wins and losses."""
-        if not pnl_values:
+        if len(pnl_values) == 0:
             return 0, 0
         
-        max_wins = 0
-        max_losses = 0
-        current_wins = 0
-        current_losses = 0
-        
-        for pnl in pnl_values:
-            if pnl > 0:
-                current_wins += 1
-                current_losses = 0
-                max_wins = max(max_wins, current_wins)
-            elif pnl < 0:
-                current_losses += 1
-                current_wins = 0
-                max_losses = max(max_losses, current_losses)
-            else:
-                current_wins = 0
-                current_losses = 0
+        # Classify each trade as +1 (win), -1 (loss) or 0 (flat), then find
+        # where the classification changes; each change starts a new run
+        pnl = np.asarray(pnl_values, dtype=np.float64)
+        signs = (pnl > 0).astype(np.int8) - (pnl < 0)
+        run_starts = np.flatnonzero(np.diff(signs, prepend=signs[0] - 1))
+        run_lengths = np.diff(np.append(run_starts, signs.size))
+        run_signs = signs[run_starts]
+        
+        max_wins = int(run_lengths[run_signs == 1].max(initial=0))
+        max_losses = int(run_lengths[run_signs == -1].max(initial=0))
         
         return max_wins, max_losses
     
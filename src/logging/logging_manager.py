@@ -6,13 +6,21 @@ of sensitive data and configurable log levels.
 """
 
 import json
+import copy
 import csv
+import functools
 import logging
+import logging.handlers
 import os
+import queue
+import re
+import shutil
+import atexit
+import time
+import weakref
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from pathlib import Path
-from dataclasses import asdict
 
 try:
     from ..models.trading_models import Trade, TradeLeg, TradingSignal
@@ -24,6 +32,18 @@ except ImportError:
     from models.config_models import LoggingConfig
 
 
+# Shared encoder for log entries; json.dumps builds a fresh JSONEncoder on
+# every call whenever options such as ensure_ascii are passed
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+def _cleanup_manager_at_exit(manager_ref: "weakref.ref[LoggingManager]") -> None:
+    """Write out a logging manager's queued records at exit if it is still alive."""
+    manager = manager_ref()
+    if manager is not None:
+        manager.cleanup()
+
+
 class LoggingManager:
     """
     Manages all logging operations for the trading system.
@@ -54,11 +74,29 @@ class LoggingManager:
         # Initialize loggers
         self._setup_loggers()
         
+        # (epoch second, ISO string) of the last second-resolution timestamp
+        self._ts_cache = (-1, '')
+        # Timestamp precision never changes after startup, so pick the
+        # formatter once rather than checking config on every event
+        self._now_iso = self._now_iso_precise if config.subsecond_timestamps else self._now_iso_cached
+        
+        # (level number, bound log method) for log_system_event, resolved
+        # once instead of per call
+        self._level_dispatch = {
+            'DEBUG': (logging.DEBUG, self.system_logger.debug),
+            'INFO': (logging.INFO, self.system_logger.info),
+            'WARNING': (logging.WARNING, self.system_logger.warning),
+            'ERROR': (logging.ERROR, self.system_logger.error),
+            'CRITICAL': (logging.CRITICAL, self.system_logger.critical)
+        }
+        
         # Sensitive data patterns to sanitize
         self.sensitive_patterns = [
             'api_key', 'client_code', 'pin', 'totp_secret',
             'password', 'token', 'secret', 'credential'
         ]
+        # One compiled alternation replaces a substring scan per pattern
+        self._sensitive_re = re.compile('|'.join(map(re.escape, self.sensitive_patterns)))
     
     def _setup_loggers(self) -> None:
         """Set up different loggers for various purposes."""
@@ -70,13 +108,23 @@ class LoggingManager:
         # Create JSON formatter
         json_formatter = JsonFormatter()
         
-        # System log file handler
-        system_handler = logging.FileHandler(
+        # File writes happen on a listener thread; loggers only enqueue, so
+        # callers on the trading path never wait on disk I/O. Both loggers
+        # share the queue and each file handler filters for its own logger.
+        self._log_queue: queue.Queue = queue.Queue()
+        queue_handler = ExceptionTextQueueHandler(self._log_queue)
+        
+        # System log file handler, size-capped so a burst cannot grow the
+        # file without bound during a session
+        system_handler = BufferedRotatingFileHandler(
             self.daily_log_dir / 'system.log',
+            maxBytes=self.config.max_file_size,
+            backupCount=self.config.backup_count,
             encoding='utf-8'
         )
         system_handler.setFormatter(json_formatter)
-        self.system_logger.addHandler(system_handler)
+        system_handler.addFilter(logging.Filter(self.system_logger.name))
+        self.system_logger.addHandler(queue_handler)
         
         # Console handler if enabled
         if self.config.console_logging:
@@ -94,16 +142,30 @@ class LoggingManager:
         self.error_logger = logging.getLogger('errors')
         self.error_logger.setLevel(logging.ERROR)
         
-        error_handler = logging.FileHandler(
+        error_handler = BufferedRotatingFileHandler(
             self.daily_log_dir / 'errors.log',
+            maxBytes=self.config.max_file_size,
+            backupCount=self.config.backup_count,
             encoding='utf-8'
         )
         error_handler.setFormatter(json_formatter)
-        self.error_logger.addHandler(error_handler)
+        error_handler.addFilter(logging.Filter(self.error_logger.name))
+        self.error_logger.addHandler(queue_handler)
+        
+        self._queue_handler = queue_handler
+        self._file_handlers = [system_handler, error_handler]
+        # The file handlers buffer writes; the listener flushes them whenever
+        # the queue runs dry so idle periods never leave records in memory
+        self._log_listener = FlushOnIdleQueueListener(self._log_queue, *self._file_handlers)
+        self._log_listener.start()
+        # Registered through a weak reference so the exit hook does not keep
+        # an abandoned manager (and its open log files) alive
+        self._exit_hook = functools.partial(_cleanup_manager_at_exit, weakref.ref(self))
+        atexit.register(self._exit_hook)
     
     def log_system_event(self, event_type: str, message: str, 
                         data: Optional[Dict[str, Any]] = None,
-                        level: str = 'INFO') -> None:
+                        level: str = 'INFO', *, sanitize: bool = True) -> None:
         """
         Log a system event with structured data.
         
@@ -112,16 +174,49 @@ class LoggingManager:
             message: Human-readable message
             data: Additional structured data
             level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+            sanitize: Redact sensitive keys in data; pass False only when the
+                caller has already sanitized every caller-supplied value
         """
+        level_int, log_method = self._level_dispatch[level.upper()]
+        # Skip building and sanitizing the entry when the level is filtered out
+        if not self.system_logger.isEnabledFor(level_int):
+            return
+        
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self._now_iso(),
             'event_type': event_type,
             'message': message,
-            'data': self._sanitize_data(data or {})
+            'data': self._sanitize_data(data or {}) if sanitize else (data or {})
         }
         
-        log_method = getattr(self.system_logger, level.lower())
-        log_method(json.dumps(log_entry))
+        # The message is already the final JSON line; flag it so JsonFormatter
+        # writes it as-is instead of parsing and re-serializing it
+        log_method(_json_encoder.encode(log_entry), extra={'preformatted': True})
+    
+    def _now_iso_cached(self) -> str:
+        """
+        Get the current time for a log entry in ISO format, to the second.
+        
+        Each second is formatted once and reused for later events in it.
+        
+        Returns:
+            ISO formatted timestamp
+        """
+        sec = int(time.time())
+        cached_sec, cached_iso = self._ts_cache
+        if sec != cached_sec:
+            cached_iso = datetime.fromtimestamp(sec).isoformat()
+            self._ts_cache = (sec, cached_iso)
+        return cached_iso
+    
+    def _now_iso_precise(self) -> str:
+        """
+        Get the current time for a log entry in ISO format, with microseconds.
+        
+        Returns:
+            ISO formatted timestamp
+        """
+        return datetime.now().isoformat()
     
     def log_trade_event(self, trade: Trade, event_type: str, 
                        additional_data: Optional[Dict[str, Any]] = None) -> None:
@@ -164,8 +259,9 @@ class LoggingManager:
             'additional_data': self._sanitize_data(additional_data or {})
         }
         
+        # Only additional_data can carry caller secrets and it is sanitized above
         self.log_system_event('ERROR', f"Error in {context}: {str(error)}", 
-                            error_data, 'ERROR')
+                            error_data, 'ERROR', sanitize=False)
     
     def log_strategy_signal(self, signal: TradingSignal) -> None:
         """
@@ -174,24 +270,30 @@ class LoggingManager:
         Args:
             signal: Generated trading signal
         """
-        signal_data = asdict(signal)
-        # Convert datetime to ISO format
-        if 'timestamp' in signal_data and signal_data['timestamp']:
-            signal_data['timestamp'] = signal_data['timestamp'].isoformat()
-        
-        # Convert enums to their values
-        if 'signal_type' in signal_data and hasattr(signal_data['signal_type'], 'value'):
-            signal_data['signal_type'] = signal_data['signal_type'].value
-        
-        if 'option_types' in signal_data:
-            signal_data['option_types'] = [
-                ot.value if hasattr(ot, 'value') else str(ot) 
-                for ot in signal_data['option_types']
-            ]
+        # Built field by field; asdict() would deep-copy the signal only for
+        # the enums and timestamp to be converted afterwards
+        signal_data = {
+            'strategy_name': signal.strategy_name,
+            'signal_type': signal.signal_type.value if hasattr(signal.signal_type, 'value') else signal.signal_type,
+            'underlying': signal.underlying,
+            'strikes': list(signal.strikes),
+            'option_types': [
+                ot.value if hasattr(ot, 'value') else str(ot)
+                for ot in signal.option_types
+            ],
+            'quantities': list(signal.quantities),
+            'confidence': signal.confidence,
+            'timestamp': signal.timestamp.isoformat() if signal.timestamp else signal.timestamp,
+            'expiry_date': signal.expiry_date,
+            'target_pnl': signal.target_pnl,
+            'stop_loss': signal.stop_loss,
+            'metadata': self._sanitize_data(signal.metadata)
+        }
         
+        # Metadata is the only free-form part of the signal and is sanitized above
         self.log_system_event('STRATEGY_SIGNAL', 
                             f"Signal generated by {signal.strategy_name}",
-                            signal_data)
+                            signal_data, sanitize=False)
     
     def log_performance_metrics(self, metrics: Dict[str, Any]) -> None:
         """
@@ -204,37 +306,69 @@ class LoggingManager:
                             "Performance metrics calculated",
                             metrics)
     
+    def _is_sensitive_key(self, key: Any) -> bool:
+        """Check whether a key name matches any sensitive pattern."""
+        return isinstance(key, str) and self._sensitive_re.search(key.lower()) is not None
+    
+    def _has_sensitive(self, data: Dict[str, Any]) -> bool:
+        """
+        Check whether any key that _sanitize_data would inspect is sensitive.
+        
+        Args:
+            data: Data dictionary to scan
+            
+        Returns:
+            True on the first sensitive key found
+        """
+        stack = [data]
+        while stack:
+            for key, value in stack.pop().items():
+                if self._is_sensitive_key(key):
+                    return True
+                if isinstance(value, dict):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(item for item in value if isinstance(item, dict))
+        
+        return False
+    
     def _sanitize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Remove or mask sensitive data from log entries.
         
+        Data without any sensitive keys is returned as-is rather than copied.
+        
         Args:
             data: Data dictionary to sanitize
             
         Returns:
             Sanitized data dictionary
         """
-        if not isinstance(data, dict):
+        if not isinstance(data, dict) or not self._has_sensitive(data):
             return data
         
         sanitized = {}
-        for key, value in data.items():
-            key_lower = key.lower()
-            
-            # Check if key contains sensitive patterns
-            is_sensitive = any(pattern in key_lower for pattern in self.sensitive_patterns)
-            
-            if is_sensitive:
-                sanitized[key] = "***REDACTED***"
-            elif isinstance(value, dict):
-                sanitized[key] = self._sanitize_data(value)
-            elif isinstance(value, list):
-                sanitized[key] = [
-                    self._sanitize_data(item) if isinstance(item, dict) else item
-                    for item in value
-                ]
-            else:
-                sanitized[key] = value
+        # Copy nested dicts through an explicit stack of (source, copy) pairs
+        stack = [(data, sanitized)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if self._is_sensitive_key(key):
+                    target[key] = "***REDACTED***"
+                elif isinstance(value, dict):
+                    target[key] = {}
+                    stack.append((value, target[key]))
+                elif isinstance(value, list):
+                    items = []
+                    for item in value:
+                        if isinstance(item, dict):
+                            items.append({})
+                            stack.append((item, items[-1]))
+                        else:
+                            items.append(item)
+                    target[key] = items
+                else:
+                    target[key] = value
         
         return sanitized
     
@@ -261,24 +395,67 @@ class LoggingManager:
         """
         Rotate old log files, keeping only recent ones.
         
+        This removes whole daily directories; within a day, system.log and
+        errors.log are capped by size as they are written.
+        
         Args:
             days_to_keep: Number of days of logs to retain
         """
         cutoff_date = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
         
-        for date_dir in self.log_dir.iterdir():
-            if date_dir.is_dir():
+        # scandir reports directory type without a stat call per entry
+        with os.scandir(self.log_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                # Skip anything that isn't a YYYY-MM-DD directory
+                if not entry.is_dir(follow_symlinks=False) or len(name) != 10 \
+                        or name[4] != '-' or name[7] != '-':
+                    continue
+                
                 try:
-                    dir_date = datetime.strptime(date_dir.name, '%Y-%m-%d')
-                    if dir_date.timestamp() < cutoff_date:
-                        # Archive or delete old logs
-                        import shutil
-                        shutil.rmtree(date_dir)
-                        self.log_system_event('LOG_ROTATION', 
-                                            f"Deleted old logs for {date_dir.name}")
+                    dir_date = datetime(int(name[:4]), int(name[5:7]), int(name[8:10]))
                 except ValueError:
-                    # Skip directories that don't match date format
                     continue
+                
+                if dir_date.timestamp() < cutoff_date:
+                    # Archive or delete old logs
+                    shutil.rmtree(self.log_dir / name)
+                    self.log_system_event('LOG_ROTATION', 
+                                        f"Deleted old logs for {name}")
+    
+    def flush(self) -> None:
+        """Block until every queued log record has been written to its file."""
+        if self._log_listener is not None:
+            self._log_queue.join()
+        
+        for handler in self._file_handlers:
+            handler.flush()
+    
+    def cleanup(self) -> None:
+        """Write out queued log records, stop the listener thread and close the log files."""
+        if self._log_listener is None:
+            return
+        
+        self._log_listener.stop()
+        self._log_listener = None
+        
+        # Rebind rather than removeHandler: cleanup can run from __del__ during
+        # a log call, and removing from the list Logger.callHandlers is
+        # iterating would skip the handler after ours
+        for logger in (self.system_logger, self.error_logger):
+            logger.handlers = [h for h in logger.handlers if h is not self._queue_handler]
+        
+        for handler in self._file_handlers:
+            handler.close()
+        
+        atexit.unregister(self._exit_hook)
+    
+    def __del__(self):
+        """Stop the listener and close the log files if cleanup was never called."""
+        try:
+            self.cleanup()
+        except Exception:
+            pass
 
 
 class JsonFormatter(logging.Formatter):
@@ -286,10 +463,14 @@ class JsonFormatter(logging.Formatter):
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
+        # Entries from LoggingManager are serialized once at the call site
+        if getattr(record, 'preformatted', False):
+            return record.getMessage()
+        
         # Try to parse message as JSON first
         try:
             message_data = json.loads(record.getMessage())
-            return json.dumps(message_data, ensure_ascii=False)
+            return _json_encoder.encode(message_data)
         except (json.JSONDecodeError, ValueError):
             # Fallback to standard format wrapped in JSON
             log_entry = {
@@ -302,7 +483,114 @@ class JsonFormatter(logging.Formatter):
                 'line': record.lineno
             }
             
-            if record.exc_info:
-                log_entry['exception'] = self.formatException(record.exc_info)
+            # Records from the log queue carry the traceback as exc_text only
+            if record.exc_info and not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            if record.exc_text:
+                log_entry['exception'] = record.exc_text
+            
+            return _json_encoder.encode(log_entry)
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Size-rotating file handler that batches writes in a userland buffer.
+    
+    Records are encoded to UTF-8 and written to a binary BufferedWriter, so
+    many log lines reach the OS in one write call. The file size is tracked
+    with a byte counter because RotatingFileHandler's own check seeks the
+    stream, which would flush the buffer on every record. Callers are
+    responsible for flushing; FlushOnIdleQueueListener does this whenever
+    its queue is empty.
+    """
+    
+    def __init__(self, filename, mode: str = 'a', maxBytes: int = 0,
+                 backupCount: int = 0, encoding: Optional[str] = 'utf-8',
+                 delay: bool = False, buffer_size: int = 8192):
+        """
+        Initialize the handler.
+        
+        Args:
+            filename: Log file path
+            mode: File open mode ('a' or 'w')
+            maxBytes: Size at which the file is rolled over, 0 to disable
+            backupCount: Number of rolled over files to keep
+            encoding: Text encoding applied to each record
+            delay: Defer opening the file until the first record
+            buffer_size: Size of the userland write buffer in bytes
+        """
+        self.buffer_size = buffer_size
+        self._bytes_written = 0
+        super().__init__(filename, mode=mode, maxBytes=maxBytes,
+                         backupCount=backupCount, encoding=encoding, delay=delay)
+    
+    def _open(self):
+        """Open the log file as a buffered binary stream."""
+        stream = self._builtin_open(self.baseFilename, self.mode.replace('b', '') + 'b',
+                      buffering=self.buffer_size)
+        self._bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Encode a record and append it to the write buffer, rolling over by size."""
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding or 'utf-8')
+            
+            if self.stream is None:
+                if self.mode != 'w' or not self._closed:
+                    self.stream = self._open()
             
-            return json.dumps(log_entry, ensure_ascii=False)
\ No newline at end of file
+            if self.maxBytes > 0 and self._bytes_written and \
+                    self._bytes_written + len(data) > self.maxBytes:
+                self.doRollover()
+            
+            if self.stream is not None:
+                self.stream.write(data)
+                self._bytes_written += len(data)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class ExceptionTextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that keeps a record's traceback separate from its message.
+    
+    QueueHandler.prepare folds the traceback into the message and clears
+    exc_info, which would leave JsonFormatter nothing to put in its
+    'exception' field. Here the message is merged with its args as usual,
+    but the traceback is kept as exc_text; the exc_info tuple itself is
+    still dropped so queued records do not hold frames alive.
+    """
+    
+    _exc_formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy a record for the queue, resolving its message and traceback text."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class FlushOnIdleQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener that flushes its handlers each time the queue drains.
+    
+    Under load, buffered handlers write in large batches; once the listener
+    has caught up, everything handled so far is pushed to disk before it
+    blocks waiting for the next record.
+    """
+    
+    def dequeue(self, block: bool):
+        """Flush handlers before blocking on an empty queue."""
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return super().dequeue(block)
@@ -7,15 +7,26 @@ with configurable alert conditions and thresholds.
 
 import json
 import smtplib
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Deque
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dataclasses import asdict
 
 from ..models.config_models import NotificationConfig, NotificationType
-from ..models.trading_models import Trade, TradingSignal
+from ..models.trading_models import Trade, TradingSignal, OrderAction
+
+
+# Shared encoder for HTTP payloads: compact output, raw UTF-8 instead of
+# \u escapes for the emoji and rupee signs, and no NaN (invalid JSON)
+_payload_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), allow_nan=False)
 
 
 class NotificationManager:
@@ -30,6 +41,22 @@ class NotificationManager:
     - Rate limiting to prevent spam
     """
     
+    # Color coding for different alert types
+    _SLACK_COLORS = {
+        "info": "#36a64f",      # Green
+        "success": "#2eb886",   # Dark green
+        "warning": "#ff9500",   # Orange
+        "error": "#ff0000"      # Red
+    }
+    
+    # Message emoji for each alert type
+    _TG_EMOJIS = {
+        "info": "ℹ️",
+        "success": "✅",
+        "warning": "⚠️",
+        "error": "🚨"
+    }
+    
     def __init__(self, config: NotificationConfig):
         """
         Initialize the notification manager.
@@ -38,12 +65,50 @@ class NotificationManager:
             config: Notification configuration settings
         """
         self.config = config
-        self.last_notification_times: Dict[str, datetime] = {}
-        self.notification_counts: Dict[str, int] = {}
         
         # Rate limiting settings (prevent spam)
         self.rate_limit_window = 300  # 5 minutes
         self.max_notifications_per_window = 10
+        # Monotonic send times per notification type within the window, oldest first
+        self._rate_windows: Dict[str, Deque[float]] = defaultdict(deque)
+        
+        # One pooled session for webhook, Slack and Telegram so repeat
+        # notifications reuse open keep-alive connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['POST']),
+                raise_on_status=False  # Let raise_for_status report the final response
+            )
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        # Channel sends run here so trading callbacks never block on network I/O
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notify")
+        
+        # Reused SMTP connection; executor threads take the lock to use it
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_opened_at = 0.0
+        self._smtp_lock = threading.Lock()
+        self.smtp_max_age = 300  # Reconnect after 5 minutes
+        
+        # (bot token, sendMessage URL) for Telegram
+        self._tg_url = ("", "")
+        
+        # Channels with the settings they need, resolved once so messages skip
+        # half-configured channels without visiting them
+        self._active_channels: List[NotificationType] = []
+        for notification_type in self.config.types:
+            if self._is_channel_configured(notification_type):
+                self._active_channels.append(notification_type)
+            else:
+                print(f"Notification channel {notification_type.value} is enabled but not fully configured; skipping it")
     
     def send_trade_entry_notification(self, trade: Trade) -> None:
         """
@@ -172,24 +237,61 @@ class NotificationManager:
         """
         Send notification through all configured channels.
         
+        Each channel is sent on the background executor, so the caller returns
+        immediately and a slow channel does not hold up the others.
+        
         Args:
             title: Notification title
             message: Notification message
             alert_type: Type of alert (info, success, warning, error)
         """
-        for notification_type in self.config.types:
-            try:
-                if notification_type == NotificationType.WEBHOOK:
-                    self._send_webhook(title, message, alert_type)
-                elif notification_type == NotificationType.EMAIL:
-                    self._send_email(title, message, alert_type)
-                elif notification_type == NotificationType.SLACK:
-                    self._send_slack(title, message, alert_type)
-                elif notification_type == NotificationType.TELEGRAM:
-                    self._send_telegram(title, message, alert_type)
-            except Exception as e:
-                # Log error but don't fail the entire notification process
-                print(f"Failed to send {notification_type.value} notification: {e}")
+        for notification_type in self._active_channels:
+            self._executor.submit(self._dispatch, notification_type, title, message, alert_type)
+    
+    def _is_channel_configured(self, notification_type: NotificationType) -> bool:
+        """
+        Check whether a channel has the settings it needs to send.
+        
+        Args:
+            notification_type: Channel to check
+            
+        Returns:
+            True if the channel can send, False otherwise
+        """
+        if notification_type == NotificationType.WEBHOOK:
+            return bool(self.config.webhook_url)
+        elif notification_type == NotificationType.EMAIL:
+            return all([self.config.email_smtp_server, self.config.email_username,
+                        self.config.email_to])
+        elif notification_type == NotificationType.SLACK:
+            return bool(self.config.slack_webhook_url)
+        elif notification_type == NotificationType.TELEGRAM:
+            return all([self.config.telegram_bot_token, self.config.telegram_chat_id])
+        return False
+    
+    def _dispatch(self, notification_type: NotificationType, title: str, 
+                  message: str, alert_type: str) -> None:
+        """
+        Send a notification through a single channel.
+        
+        Args:
+            notification_type: Channel to send through
+            title: Notification title
+            message: Notification message
+            alert_type: Type of alert (info, success, warning, error)
+        """
+        try:
+            if notification_type == NotificationType.WEBHOOK:
+                self._send_webhook(title, message, alert_type)
+            elif notification_type == NotificationType.EMAIL:
+                self._send_email(title, message, alert_type)
+            elif notification_type == NotificationType.SLACK:
+                self._send_slack(title, message, alert_type)
+            elif notification_type == NotificationType.TELEGRAM:
+                self._send_telegram(title, message, alert_type)
+        except Exception as e:
+            # Log error but don't fail the entire notification process
+            print(f"Failed to send {notification_type.value} notification: {e}")
     
     def _send_webhook(self, title: str, message: str, alert_type: str) -> None:
         """Send webhook notification."""
@@ -204,13 +306,7 @@ class NotificationManager:
             "source": "banknifty-trading-system"
         }
         
-        response = requests.post(
-            self.config.webhook_url,
-            json=payload,
-            timeout=10,
-            headers={"Content-Type": "application/json"}
-        )
-        response.raise_for_status()
+        self._post_json(self.config.webhook_url, payload)
     
     def _send_email(self, title: str, message: str, alert_type: str) -> None:
         """Send email notification."""
@@ -241,32 +337,68 @@ This is an automated message from the Bank Nifty Trading System.
         
         msg.attach(MIMEText(body, 'plain'))
         
-        # Send email
-        with smtplib.SMTP(self.config.email_smtp_server, self.config.email_smtp_port) as server:
-            server.starttls()
-            if self.config.email_password:
-                server.login(self.config.email_username, self.config.email_password)
-            
-            text = msg.as_string()
-            server.sendmail(self.config.email_username, self.config.email_to, text)
+        # Send email over the shared connection, reconnecting once if the
+        # server dropped it since the last check
+        text = msg.as_string()
+        with self._smtp_lock:
+            try:
+                self._get_smtp().sendmail(self.config.email_username, self.config.email_to, text)
+            except smtplib.SMTPServerDisconnected:
+                self._close_smtp()
+                self._get_smtp().sendmail(self.config.email_username, self.config.email_to, text)
+    
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        server = smtplib.SMTP(self.config.email_smtp_server, self.config.email_smtp_port)
+        server.starttls()
+        if self.config.email_password:
+            server.login(self.config.email_username, self.config.email_password)
+        return server
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        Get the shared SMTP connection, replacing it if stale or dead.
+        
+        Must be called with _smtp_lock held.
+        
+        Returns:
+            Connected and authenticated SMTP client
+        """
+        if self._smtp is not None:
+            if time.monotonic() - self._smtp_opened_at > self.smtp_max_age:
+                self._close_smtp()
+            else:
+                try:
+                    self._smtp.noop()
+                except (smtplib.SMTPException, OSError):
+                    self._close_smtp()
+        
+        if self._smtp is None:
+            self._smtp = self._connect_smtp()
+            self._smtp_opened_at = time.monotonic()
+        
+        return self._smtp
+    
+    def _close_smtp(self) -> None:
+        """Close the shared SMTP connection, ignoring errors from a dead socket."""
+        if self._smtp is None:
+            return
+        
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
     
     def _send_slack(self, title: str, message: str, alert_type: str) -> None:
         """Send Slack notification."""
         if not self.config.slack_webhook_url:
             return
         
-        # Color coding for different alert types
-        color_map = {
-            "info": "#36a64f",      # Green
-            "success": "#2eb886",   # Dark green
-            "warning": "#ff9500",   # Orange
-            "error": "#ff0000"      # Red
-        }
-        
         payload = {
             "attachments": [
                 {
-                    "color": color_map.get(alert_type, "#36a64f"),
+                    "color": self._SLACK_COLORS.get(alert_type, "#36a64f"),
                     "title": title,
                     "text": message,
                     "footer": "Bank Nifty Trading System",
@@ -275,12 +407,7 @@ This is an automated message from the Bank Nifty Trading System.
             ]
         }
         
-        response = requests.post(
-            self.config.slack_webhook_url,
-            json=payload,
-            timeout=10
-        )
-        response.raise_for_status()
+        self._post_json(self.config.slack_webhook_url, payload)
     
     def _send_telegram(self, title: str, message: str, alert_type: str) -> None:
         """Send Telegram notification."""
@@ -288,34 +415,44 @@ This is an automated message from the Bank Nifty Trading System.
             return
         
         # Format message with emoji based on alert type
-        emoji_map = {
-            "info": "ℹ️",
-            "success": "✅",
-            "warning": "⚠️",
-            "error": "🚨"
-        }
-        
-        emoji = emoji_map.get(alert_type, "ℹ️")
+        emoji = self._TG_EMOJIS.get(alert_type, "ℹ️")
         formatted_message = f"{emoji} *{title}*\n\n{message}"
         
-        url = f"https://api.telegram.org/bot{self.config.telegram_bot_token}/sendMessage"
+        # Bot URL is rebuilt only when the configured token changes
+        token = self.config.telegram_bot_token
+        if self._tg_url[0] != token:
+            self._tg_url = (token, f"https://api.telegram.org/bot{token}/sendMessage")
+        url = self._tg_url[1]
         payload = {
             "chat_id": self.config.telegram_chat_id,
             "text": formatted_message,
             "parse_mode": "Markdown"
         }
         
-        response = requests.post(url, json=payload, timeout=10)
+        self._post_json(url, payload)
+    
+    def _post_json(self, url: str, payload: Dict[str, Any]) -> None:
+        """
+        POST a JSON payload over the shared session.
+        
+        Args:
+            url: Endpoint URL
+            payload: JSON-serializable payload
+        """
+        response = self._session.post(
+            url,
+            data=_payload_encoder.encode(payload).encode('utf-8'),
+            timeout=10,
+            headers={"Content-Type": "application/json"}
+        )
         response.raise_for_status()
     
     def _format_trade_entry_message(self, trade: Trade) -> str:
         """Format trade entry message."""
-        legs_info = []
-        for leg in trade.legs:
-            action_symbol = "📈" if leg.action == "BUY" else "📉"
-            legs_info.append(
-                f"{action_symbol} {leg.action} {leg.quantity}x {leg.strike} {leg.option_type} @ ₹{leg.entry_price}"
-            )
+        legs_info = "\n".join(
+            f"{'📈' if leg.action == OrderAction.BUY else '📉'} {leg.action} {leg.quantity}x {leg.strike} {leg.option_type} @ ₹{leg.entry_price}"
+            for leg in trade.legs
+        )
         
         return f"""
 Trade ID: {trade.trade_id}
@@ -323,7 +460,7 @@ Strategy: {trade.strategy}
 Status: {trade.status}
 
 Legs:
-{chr(10).join(legs_info)}
+{legs_info}
 
 Target P&L: ₹{trade.target_pnl:,.2f}
 Stop Loss: ₹{trade.stop_loss:,.2f}
@@ -334,16 +471,11 @@ Entry Time: {trade.entry_time.strftime('%H:%M:%S') if trade.entry_time else 'N/A
         """Format trade exit message."""
         pnl_symbol = "💰" if trade.current_pnl > 0 else "💸"
         
-        legs_info = []
-        for leg in trade.legs:
-            if leg.exit_price:
-                pnl_per_leg = (leg.exit_price - leg.entry_price) * leg.quantity
-                if leg.action == "SELL":
-                    pnl_per_leg = -pnl_per_leg
-                
-                legs_info.append(
-                    f"{leg.strike} {leg.option_type}: ₹{leg.entry_price} → ₹{leg.exit_price} (₹{pnl_per_leg:+.2f})"
-                )
+        legs_info = "\n".join(
+            f"{leg.strike} {leg.option_type}: ₹{leg.entry_price} → ₹{leg.exit_price} (₹{leg.realized_pnl:+.2f})"
+            for leg in trade.legs
+            if leg.exit_price
+        )
         
         holding_period = ""
         if trade.entry_time and trade.exit_time:
@@ -358,7 +490,7 @@ Strategy: {trade.strategy}
 {pnl_symbol} Final P&L: ₹{trade.current_pnl:+,.2f}
 
 Leg Details:
-{chr(10).join(legs_info)}
+{legs_info}
 
 {holding_period}
 Exit Time: {trade.exit_time.strftime('%H:%M:%S') if trade.exit_time else 'N/A'}
@@ -471,36 +603,27 @@ Profit Factor: {summary.get('profit_factor', 0):.2f}
         Returns:
             True if rate limited, False otherwise
         """
-        now = datetime.now()
-        
-        # Clean up old entries
-        cutoff_time = now.timestamp() - self.rate_limit_window
-        keys_to_remove = []
+        # Elapsed time only, so a monotonic clock keeps wall-clock adjustments
+        # from expiring or extending the window
+        now = time.monotonic()
         
-        for key, last_time in self.last_notification_times.items():
-            if last_time.timestamp() < cutoff_time:
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self.last_notification_times[key]
-            if key in self.notification_counts:
-                del self.notification_counts[key]
+        # Drop this type's sends that have left the window; the deque is in
+        # time order so expired entries are always at the head
+        window = self._rate_windows[notification_type]
+        cutoff_time = now - self.rate_limit_window
+        while window and window[0] < cutoff_time:
+            window.popleft()
         
         # Check rate limit
-        count = self.notification_counts.get(notification_type, 0)
-        if count >= self.max_notifications_per_window:
+        if len(window) >= self.max_notifications_per_window:
             return True
         
-        # Update counters
-        self.last_notification_times[notification_type] = now
-        self.notification_counts[notification_type] = count + 1
-        
+        window.append(now)
         return False
     
     def reset_rate_limits(self) -> None:
         """Reset all rate limit counters."""
-        self.last_notification_times.clear()
-        self.notification_counts.clear()
+        self._rate_windows.clear()
     
     def test_notifications(self) -> Dict[str, bool]:
         """
@@ -515,6 +638,11 @@ Profit Factor: {summary.get('profit_factor', 0):.2f}
         test_message = "This is a test notification from the Bank Nifty Trading System."
         
         for notification_type in self.config.types:
+            if notification_type not in self._active_channels:
+                results[notification_type.value] = False
+                print(f"Test failed for {notification_type.value}: channel is not fully configured")
+                continue
+            
             try:
                 if notification_type == NotificationType.WEBHOOK:
                     self._send_webhook(test_title, test_message, "info")
@@ -530,4 +658,18 @@ Profit Factor: {summary.get('profit_factor', 0):.2f}
                 results[notification_type.value] = False
                 print(f"Test failed for {notification_type.value}: {e}")
         
-        return results
\ No newline at end of file
+        return results
+    
+    def cleanup(self, wait: bool = True) -> None:
+        """
+        Stop the notification executor and close pooled HTTP and SMTP connections.
+        
+        Args:
+            wait: Deliver notifications already queued before returning;
+                when False, queued sends are cancelled
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self._session.close()
+        
+        with self._smtp_lock:
+            self._close_smtp()
@@ -4,15 +4,61 @@ Trade reporting and ledger management for the trading system.
 Provides detailed trade tracking, CSV export functionality, and trade ledger management.
 """
 
+import atexit
 import csv
+import functools
 import json
-from datetime import datetime, date
-from typing import List, Dict, Any, Optional
+import logging
+import os
+import threading
+import weakref
+import time
+from collections import deque
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Deque
 from pathlib import Path
 from dataclasses import asdict
 
-from ..models.trading_models import Trade, TradeLeg
+from ..models.trading_models import Trade, TradeLeg, OrderAction, TradeStatus
 from ..models.config_models import LoggingConfig
+from .analytics_engine import AnalyticsEngine
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# O_APPEND writes up to this size land whole at the end of the ledger, even
+# with other processes appending; longer rows are written under flock
+_ATOMIC_APPEND_BYTES = 4096
+
+# Shared encoder for daily summaries; json.dump with indent hands the file
+# one small write per token, so the document is encoded once and written whole
+_summary_encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _flush_reporter_at_exit(reporter_ref: "weakref.ref[TradeReporter]") -> None:
+    """Flush a trade reporter's buffered rows at exit if it is still alive."""
+    reporter = reporter_ref()
+    if reporter is not None:
+        reporter._flush_on_exit()
+
+
+def _csv_field(value: str) -> str:
+    """
+    Quote a text cell the way csv.writer's default dialect does.
+    
+    Args:
+        value: Cell text
+        
+    Returns:
+        The text, quoted with inner quotes doubled if it contains a comma,
+        quote, CR or LF
+    """
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
 
 
 class TradeReporter:
@@ -34,6 +80,7 @@ class TradeReporter:
             config: Logging configuration settings
         """
         self.config = config
+        self.logger = logging.getLogger(__name__)
         self.log_dir = Path(config.log_directory)
         self.reports_dir = self.log_dir / 'reports'
         self.reports_dir.mkdir(parents=True, exist_ok=True)
@@ -45,9 +92,34 @@ class TradeReporter:
         # Initialize trade ledger if it doesn't exist
         self._initialize_trade_ledger()
         
+        # Encoded ledger rows waiting to be appended in one batch, guarded by
+        # _ledger_lock since analytics readers flush from other threads
+        self._pending_rows: List[bytes] = []
+        self._ledger_lock = threading.Lock()
+        self._batch_size = config.ledger_batch_size
+        
+        # trade_id -> (leg values, per-leg JSON fragments, leg_details JSON)
+        # from the last ledger write
+        self._leg_json_cache: Dict[str, Tuple[tuple, Tuple[str, ...], str]] = {}
+        
+        # (100 ms tick, datetime) behind _now, for open-trade holding periods
+        self._now_cache: Tuple[int, Optional[datetime]] = (-1, None)
+        
+        # Parsed ledger rows shared by the read-side reports, keyed on the
+        # ledger's (mtime_ns, size) when it was read
+        self._ledger_rows_cache: Optional[Tuple[Tuple[int, int], List[Dict[str, str]]]] = None
+        
+        # Append descriptor kept open between batches, opened on first flush
+        self._ledger_fd: Optional[int] = None
+        # Registered through a weak reference so the exit hook does not keep
+        # an abandoned reporter (and its ledger descriptor) alive
+        self._exit_hook = functools.partial(_flush_reporter_at_exit, weakref.ref(self))
+        atexit.register(self._exit_hook)
+        
         # In-memory trade tracking
         self.active_trades: Dict[str, Trade] = {}
-        self.completed_trades: List[Trade] = []
+        # Only the most recent closed trades are kept; older ones are in the ledger
+        self.completed_trades: Deque[Trade] = deque(maxlen=config.completed_trades_cache)
     
     def _initialize_trade_ledger(self) -> None:
         """Initialize the trade ledger CSV file with headers if it doesn't exist."""
@@ -84,6 +156,9 @@ class TradeReporter:
         if trade.trade_id in self.active_trades:
             self.active_trades[trade.trade_id] = trade
             self._write_trade_to_ledger(trade, 'UPDATE')
+            if trade.status == TradeStatus.CLOSED:
+                # Closing updates are final; don't leave them sitting in the buffer
+                self.flush()
     
     def record_trade_exit(self, trade: Trade) -> None:
         """
@@ -97,6 +172,21 @@ class TradeReporter:
         
         self.completed_trades.append(trade)
         self._write_trade_to_ledger(trade, 'EXIT')
+        self._leg_json_cache.pop(trade.trade_id, None)
+        # Exits are final; don't leave them sitting in the buffer
+        self.flush()
+    
+    def create_analytics_engine(self) -> AnalyticsEngine:
+        """
+        Create an analytics engine over this reporter's ledger.
+        
+        The engine flushes this reporter's buffered rows before each read, so
+        its metrics include every recorded trade.
+        
+        Returns:
+            AnalyticsEngine reading the trade ledger
+        """
+        return AnalyticsEngine(self.trade_ledger_file, flush_ledger=self.flush)
     
     def _write_trade_to_ledger(self, trade: Trade, action: str) -> None:
         """
@@ -111,73 +201,283 @@ class TradeReporter:
         if trade.entry_time and trade.exit_time:
             holding_period = (trade.exit_time - trade.entry_time).total_seconds() / 60
         elif trade.entry_time:
-            holding_period = (datetime.now() - trade.entry_time).total_seconds() / 60
+            holding_period = (self._now() - trade.entry_time).total_seconds() / 60
         
-        # Calculate entry and exit premiums
-        entry_premium = sum(leg.entry_price * leg.quantity for leg in trade.legs if leg.entry_price)
-        exit_premium = sum(leg.exit_price * leg.quantity for leg in trade.legs if leg.exit_price)
-        
-        # Calculate realized and unrealized P&L
+        # Premiums, P&L and leg details in one pass over the legs. The trade's
+        # current P&L is accumulated here too, following Trade.current_pnl,
+        # rather than walking the legs a second time through the property
+        entry_premium = 0
+        exit_premium = 0
         realized_pnl = 0
         unrealized_pnl = 0
+        current_pnl = 0.0
+        trade_closed = trade.status == TradeStatus.CLOSED
+        leg_signature = []
         
         for leg in trade.legs:
+            is_buy = leg.action == OrderAction.BUY or leg.action == 'BUY'
+            
+            if trade_closed:
+                if leg.exit_price is not None:
+                    current_pnl += leg.realized_pnl
+            elif leg.current_price > 0:
+                current_pnl += leg.unrealized_pnl
+            
+            if leg.entry_price:
+                entry_premium += leg.entry_price * leg.quantity
+            
             if leg.exit_price:
+                exit_premium += leg.exit_price * leg.quantity
                 # Realized P&L for closed legs
-                if leg.action == 'BUY':
+                if is_buy:
                     realized_pnl += (leg.exit_price - leg.entry_price) * leg.quantity
                 else:  # SELL
                     realized_pnl += (leg.entry_price - leg.exit_price) * leg.quantity
             else:
                 # Unrealized P&L for open legs
-                if leg.action == 'BUY':
+                if is_buy:
                     unrealized_pnl += (leg.current_price - leg.entry_price) * leg.quantity
                 else:  # SELL
                     unrealized_pnl += (leg.entry_price - leg.current_price) * leg.quantity
+            
+            leg_signature.append((
+                leg.symbol, leg.strike, leg.option_type, leg.action, leg.quantity,
+                leg.entry_price, leg.exit_price, leg.current_price
+            ))
+        
+        # Leg details only change when a leg does; reuse the last JSON written
+        # for this trade while its legs are unchanged, and otherwise re-encode
+        # only the legs whose values moved
+        leg_signature = tuple(leg_signature)
+        cached_legs = self._leg_json_cache.get(trade.trade_id)
+        if cached_legs is not None and cached_legs[0] == leg_signature:
+            leg_json = cached_legs[2]
+        else:
+            if cached_legs is not None and len(cached_legs[0]) == len(leg_signature):
+                fragments = tuple(
+                    fragment if old_values == values else self._serialize_leg(values)
+                    for old_values, fragment, values in zip(cached_legs[0], cached_legs[1], leg_signature)
+                )
+            else:
+                fragments = tuple(self._serialize_leg(values) for values in leg_signature)
+            # Same layout as json.dumps on the list of leg dicts
+            leg_json = '[' + ', '.join(fragments) + ']'
+            self._leg_json_cache[trade.trade_id] = (leg_signature, fragments, leg_json)
+        
+        metadata = trade.metadata
+        status = trade.status.value if hasattr(trade.status, 'value') else str(trade.status)
+        entry_iso = trade.entry_time.isoformat() if trade.entry_time else ''
+        exit_iso = trade.exit_time.isoformat() if trade.exit_time else ''
+        holding = f'{holding_period:.2f}' if holding_period else ''
+        
+        # Timestamps and numbers never need CSV quoting; only free-text and
+        # JSON cells go through _csv_field. Money columns keep two decimals.
+        line = (
+            f'{_csv_field(trade.trade_id)},{_csv_field(trade.strategy)},{entry_iso},{exit_iso},'
+            f'{_csv_field(status)},{_csv_field(trade.underlying_symbol)},'
+            f'{_csv_field(trade.expiry_date)},{len(trade.legs)},'
+            f'{entry_premium:.2f},{exit_premium:.2f},{realized_pnl:.2f},{unrealized_pnl:.2f},'
+            f'{current_pnl:.2f},{trade.target_pnl:.2f},{trade.stop_loss:.2f},'
+            f'{trade.max_profit:.2f},{trade.max_loss:.2f},{holding},'
+            f'{_csv_field(leg_json)},{_csv_field(json.dumps(metadata) if metadata else "{}")}\r\n'
+        )
+        
+        # Queue the row; the ledger is appended to once per batch
+        with self._ledger_lock:
+            self._pending_rows.append(line.encode('utf-8'))
+            batch_full = len(self._pending_rows) >= self._batch_size
+        if batch_full:
+            self.flush()
+    
+    def _now(self) -> datetime:
+        """
+        Get the current time for a holding period, to within 100 ms.
         
-        # Prepare leg details as JSON
-        leg_details = []
-        for leg in trade.legs:
-            leg_detail = {
-                'symbol': leg.symbol,
-                'strike': leg.strike,
-                'option_type': leg.option_type.value if hasattr(leg.option_type, 'value') else str(leg.option_type),
-                'action': leg.action.value if hasattr(leg.action, 'value') else str(leg.action),
-                'quantity': leg.quantity,
-                'entry_price': leg.entry_price,
-                'exit_price': leg.exit_price,
-                'current_price': leg.current_price
-            }
-            leg_details.append(leg_detail)
-        
-        # Prepare row data
-        row_data = [
-            trade.trade_id,
-            trade.strategy,
-            trade.entry_time.isoformat() if trade.entry_time else '',
-            trade.exit_time.isoformat() if trade.exit_time else '',
-            trade.status.value if hasattr(trade.status, 'value') else str(trade.status),
-            getattr(trade, 'underlying', 'BANKNIFTY'),  # Default to BANKNIFTY
-            getattr(trade, 'expiry_date', ''),
-            len(trade.legs),
-            round(entry_premium, 2),
-            round(exit_premium, 2),
-            round(realized_pnl, 2),
-            round(unrealized_pnl, 2),
-            round(trade.current_pnl, 2),
-            round(trade.target_pnl, 2),
-            round(trade.stop_loss, 2),
-            round(getattr(trade, 'max_profit', 0), 2),
-            round(getattr(trade, 'max_loss', 0), 2),
-            round(holding_period, 2) if holding_period else '',
-            json.dumps(leg_details),
-            json.dumps(getattr(trade, 'metadata', {}))
-        ]
-        
-        # Write to CSV
-        with open(self.trade_ledger_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(row_data)
+        Holding periods are written in minutes to two decimals, so updates
+        arriving in the same 100 ms share one datetime.now() reading.
+        
+        Returns:
+            Current local time
+        """
+        tick = time.monotonic_ns() // 100_000_000
+        cached_tick, cached_now = self._now_cache
+        if tick != cached_tick:
+            cached_now = datetime.now()
+            self._now_cache = (tick, cached_now)
+        return cached_now
+    
+    @staticmethod
+    def _serialize_leg(leg_values: tuple) -> str:
+        """
+        Serialize one leg's values into its leg_details JSON object.
+        
+        Args:
+            leg_values: Tuple of (symbol, strike, option_type, action,
+                quantity, entry_price, exit_price, current_price)
+            
+        Returns:
+            JSON object for the leg
+        """
+        (symbol, strike, option_type, action, quantity,
+         entry_price, exit_price, current_price) = leg_values
+        return json.dumps({
+            'symbol': symbol,
+            'strike': strike,
+            'option_type': option_type.value if hasattr(option_type, 'value') else str(option_type),
+            'action': action.value if hasattr(action, 'value') else str(action),
+            'quantity': quantity,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'current_price': current_price
+        })
+    
+    def flush(self) -> None:
+        """
+        Append all buffered rows to the trade ledger.
+        
+        Rows leave the buffer as they are written, so if a write fails only
+        the rows (or the tail of the row) not yet in the ledger stay queued
+        for the next flush.
+        """
+        with self._ledger_lock:
+            if not self._pending_rows:
+                return
+            
+            if self._ledger_fd is None:
+                # O_APPEND positions every write at the current end of file, so
+                # a row is never interleaved with rows from another writer
+                self._ledger_fd = os.open(
+                    self.trade_ledger_file,
+                    os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0),
+                    0o644
+                )
+            
+            written_rows = 0
+            try:
+                for index in range(len(self._pending_rows)):
+                    self._write_pending_row(index)
+                    written_rows += 1
+            finally:
+                del self._pending_rows[:written_rows]
+    
+    def _write_pending_row(self, index: int) -> None:
+        """
+        Write one buffered row to the ledger, one write per row where possible.
+        
+        The buffered row is trimmed after every write, so it only ever holds
+        the bytes not yet in the ledger. Caller must hold _ledger_lock.
+        
+        Args:
+            index: Position of the row in _pending_rows
+        """
+        row = self._pending_rows[index]
+        if len(row) <= _ATOMIC_APPEND_BYTES:
+            written = os.write(self._ledger_fd, row)
+            if written == len(row):
+                return
+            row = self._pending_rows[index] = row[written:]
+        
+        # Long rows and short-write tails take several writes; hold the file
+        # lock so other locking writers cannot append in between
+        if fcntl is not None:
+            fcntl.flock(self._ledger_fd, fcntl.LOCK_EX)
+        try:
+            while row:
+                written = os.write(self._ledger_fd, row)
+                row = self._pending_rows[index] = row[written:]
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._ledger_fd, fcntl.LOCK_UN)
+    
+    def _flush_on_exit(self) -> None:
+        """Flush at interpreter exit, reporting rather than raising on failure."""
+        try:
+            self.flush()
+        except OSError as e:
+            self.logger.error("Failed to write %d pending trade ledger rows: %s",
+                              len(self._pending_rows), e)
+    
+    def cleanup(self) -> None:
+        """Write out buffered ledger rows and close the ledger file."""
+        self.flush()
+        with self._ledger_lock:
+            if self._ledger_fd is not None:
+                os.close(self._ledger_fd)
+                self._ledger_fd = None
+        atexit.unregister(self._exit_hook)
+    
+    def __del__(self):
+        """Write out buffered rows and close the ledger if cleanup was never called."""
+        try:
+            self.cleanup()
+        except Exception:
+            pass
+    
+    def _load_ledger_rows(self) -> List[Dict[str, str]]:
+        """
+        Load all ledger rows, parsing the file only when it has changed.
+        
+        Export, history and summary calls made together (e.g. at end of day)
+        share one parse of the ledger. The returned list and its rows are
+        shared, so callers must not modify them.
+        
+        Returns:
+            All ledger rows in file order
+        """
+        try:
+            stat = self.trade_ledger_file.stat()
+        except FileNotFoundError:
+            self._ledger_rows_cache = None
+            return []
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._ledger_rows_cache is not None and self._ledger_rows_cache[0] == key:
+            return self._ledger_rows_cache[1]
+        
+        with open(self.trade_ledger_file, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self._ledger_rows_cache = (key, rows)
+        return rows
+    
+    def _read_ledger_rows(self, start_date: Optional[date] = None,
+                          end_date: Optional[date] = None) -> List[Dict[str, str]]:
+        """
+        Read ledger rows whose entry date falls within a date range.
+        
+        Dates are compared as 'YYYY-MM-DD' strings taken from the ISO entry
+        time, which orders the same way as the dates themselves, so rows are
+        filtered without parsing full timestamps. Rows without a valid entry
+        date are skipped.
+        
+        Args:
+            start_date: First entry date to include, or None for no lower bound
+            end_date: Last entry date to include, or None for no upper bound
+            
+        Returns:
+            Matching ledger rows in file order
+        """
+        start_day = start_date.isoformat() if start_date else None
+        end_day = end_date.isoformat() if end_date else None
+        rows = []
+        
+        for row in self._load_ledger_rows():
+            if not row['entry_time']:
+                continue
+            
+            entry_day = row['entry_time'][:10]
+            if start_day and entry_day < start_day:
+                continue
+            if end_day and entry_day > end_day:
+                continue
+            
+            try:
+                date.fromisoformat(entry_day)
+            except ValueError:
+                continue  # Skip rows with invalid dates
+            
+            rows.append(row)
+        
+        return rows
     
     def export_trades_csv(self, start_date: Optional[date] = None, 
                          end_date: Optional[date] = None,
@@ -198,29 +498,10 @@ class TradeReporter:
             filename = f"trades_export_{date_suffix}.csv"
         
         export_path = self.reports_dir / filename
+        self.flush()
         
         # Read existing ledger and filter by date range
-        trades_data = []
-        
-        if self.trade_ledger_file.exists():
-            with open(self.trade_ledger_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Parse entry time for date filtering
-                    if row['entry_time']:
-                        try:
-                            entry_date = datetime.fromisoformat(row['entry_time']).date()
-                            
-                            # Apply date filters
-                            if start_date and entry_date < start_date:
-                                continue
-                            if end_date and entry_date > end_date:
-                                continue
-                            
-                            trades_data.append(row)
-                        except ValueError:
-                            # Skip rows with invalid dates
-                            continue
+        trades_data = self._read_ledger_rows(start_date, end_date)
         
         # Write filtered data to export file
         if trades_data:
@@ -246,30 +527,31 @@ class TradeReporter:
         Returns:
             List of trade records
         """
-        cutoff_date = datetime.now().date() - datetime.timedelta(days=days)
+        # Entry dates are compared as 'YYYY-MM-DD' prefixes of the ISO entry time
+        cutoff_day = (date.today() - timedelta(days=days)).isoformat()
         trades = []
+        self.flush()
         
-        if self.trade_ledger_file.exists():
-            with open(self.trade_ledger_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Apply filters
-                    if trade_id and row['trade_id'] != trade_id:
-                        continue
-                    
-                    if strategy and row['strategy'] != strategy:
-                        continue
-                    
-                    # Date filter
-                    if row['entry_time']:
-                        try:
-                            entry_date = datetime.fromisoformat(row['entry_time']).date()
-                            if entry_date < cutoff_date:
-                                continue
-                        except ValueError:
-                            continue
-                    
-                    trades.append(row)
+        for row in self._load_ledger_rows():
+            # Apply filters
+            if trade_id and row['trade_id'] != trade_id:
+                continue
+            
+            if strategy and row['strategy'] != strategy:
+                continue
+            
+            # Date filter
+            if row['entry_time']:
+                entry_day = row['entry_time'][:10]
+                if entry_day < cutoff_day:
+                    continue
+                try:
+                    date.fromisoformat(entry_day)
+                except ValueError:
+                    continue
+            
+            # Copies, since the parsed rows are shared with the other reports
+            trades.append(dict(row))
         
         return trades
     
@@ -288,16 +570,20 @@ class TradeReporter:
                 'trades': []
             }
         
-        total_unrealized_pnl = sum(trade.current_pnl for trade in self.active_trades.values())
-        strategies = list(set(trade.strategy for trade in self.active_trades.values()))
-        
+        # current_pnl walks every leg, so evaluate it once per trade and
+        # gather the totals in the same pass
+        total_unrealized_pnl = 0
+        strategies = set()
         trades_summary = []
         for trade in self.active_trades.values():
+            current_pnl = trade.current_pnl
+            total_unrealized_pnl += current_pnl
+            strategies.add(trade.strategy)
             trades_summary.append({
                 'trade_id': trade.trade_id,
                 'strategy': trade.strategy,
                 'status': trade.status,
-                'current_pnl': trade.current_pnl,
+                'current_pnl': current_pnl,
                 'target_pnl': trade.target_pnl,
                 'stop_loss': trade.stop_loss,
                 'entry_time': trade.entry_time.isoformat() if trade.entry_time else None
@@ -306,7 +592,7 @@ class TradeReporter:
         return {
             'total_active_trades': len(self.active_trades),
             'total_unrealized_pnl': round(total_unrealized_pnl, 2),
-            'strategies_in_use': strategies,
+            'strategies_in_use': list(strategies),
             'trades': trades_summary
         }
     
@@ -324,62 +610,71 @@ class TradeReporter:
             target_date = date.today()
         
         # Get trades for the target date
-        daily_trades = []
-        
-        if self.trade_ledger_file.exists():
-            with open(self.trade_ledger_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['entry_time']:
-                        try:
-                            entry_date = datetime.fromisoformat(row['entry_time']).date()
-                            if entry_date == target_date:
-                                daily_trades.append(row)
-                        except ValueError:
-                            continue
-        
-        # Calculate summary statistics
-        total_trades = len(daily_trades)
-        completed_trades = [t for t in daily_trades if t['status'] == 'CLOSED']
-        winning_trades = [t for t in completed_trades if float(t['total_pnl']) > 0]
-        losing_trades = [t for t in completed_trades if float(t['total_pnl']) < 0]
+        self.flush()
+        daily_trades = self._read_ledger_rows(target_date, target_date)
         
-        total_pnl = sum(float(t['total_pnl']) for t in daily_trades if t['total_pnl'])
-        realized_pnl = sum(float(t['realized_pnl']) for t in daily_trades if t['realized_pnl'])
-        unrealized_pnl = sum(float(t['unrealized_pnl']) for t in daily_trades if t['unrealized_pnl'])
-        
-        win_rate = (len(winning_trades) / len(completed_trades) * 100) if completed_trades else 0
-        avg_win = sum(float(t['total_pnl']) for t in winning_trades) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum(float(t['total_pnl']) for t in losing_trades) / len(losing_trades) if losing_trades else 0
-        
-        # Strategy breakdown
+        # Calculate summary statistics and the strategy breakdown in one pass
+        total_trades = len(daily_trades)
+        completed_count = 0
+        winning_count = 0
+        losing_count = 0
+        win_sum = 0
+        loss_sum = 0
+        total_pnl = 0
+        realized_pnl = 0
+        unrealized_pnl = 0
         strategy_stats = {}
+        _float = float
+        
         for trade in daily_trades:
+            pnl_cell = trade['total_pnl']
+            pnl = _float(pnl_cell) if pnl_cell else 0
+            total_pnl += pnl
+            if trade['realized_pnl']:
+                realized_pnl += _float(trade['realized_pnl'])
+            if trade['unrealized_pnl']:
+                unrealized_pnl += _float(trade['unrealized_pnl'])
+            
             strategy = trade['strategy']
-            if strategy not in strategy_stats:
-                strategy_stats[strategy] = {
+            stats = strategy_stats.get(strategy)
+            if stats is None:
+                stats = strategy_stats[strategy] = {
                     'trades': 0,
                     'pnl': 0,
                     'wins': 0,
                     'losses': 0
                 }
+            stats['trades'] += 1
+            stats['pnl'] += pnl
             
-            strategy_stats[strategy]['trades'] += 1
-            strategy_stats[strategy]['pnl'] += float(trade['total_pnl']) if trade['total_pnl'] else 0
-            
-            if trade['status'] == 'CLOSED' and trade['total_pnl']:
-                if float(trade['total_pnl']) > 0:
-                    strategy_stats[strategy]['wins'] += 1
-                else:
-                    strategy_stats[strategy]['losses'] += 1
+            if trade['status'] == 'CLOSED':
+                completed_count += 1
+                closed_pnl = _float(pnl_cell)
+                if closed_pnl > 0:
+                    winning_count += 1
+                    win_sum += closed_pnl
+                elif closed_pnl < 0:
+                    losing_count += 1
+                    loss_sum += closed_pnl
+                
+                # A flat close counts as a strategy loss
+                if pnl_cell:
+                    if closed_pnl > 0:
+                        stats['wins'] += 1
+                    else:
+                        stats['losses'] += 1
+        
+        win_rate = (winning_count / completed_count * 100) if completed_count else 0
+        avg_win = win_sum / winning_count if winning_count else 0
+        avg_loss = loss_sum / losing_count if losing_count else 0
         
         summary = {
             'date': target_date.isoformat(),
             'total_trades': total_trades,
-            'completed_trades': len(completed_trades),
-            'active_trades': total_trades - len(completed_trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
+            'completed_trades': completed_count,
+            'active_trades': total_trades - completed_count,
+            'winning_trades': winning_count,
+            'losing_trades': losing_count,
             'win_rate': round(win_rate, 2),
             'total_pnl': round(total_pnl, 2),
             'realized_pnl': round(realized_pnl, 2),
@@ -394,6 +689,6 @@ class TradeReporter:
         # Save daily summary to file
         summary_file = self.reports_dir / f'daily_summary_{target_date.strftime("%Y%m%d")}.json'
         with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+            f.write(_summary_encoder.encode(summary))
         
         return summary
\ No newline at end of file
@@ -269,6 +269,9 @@ class LoggingConfig:
     date_format: str = "%Y-%m-%d %H:%M:%S"
     enable_json: bool = True
     enable_csv: bool = True
+    subsecond_timestamps: bool = False  # Event timestamps to the second unless enabled
+    ledger_batch_size: int = 64  # Trade ledger rows buffered per file write
+    completed_trades_cache: int = 1000  # Closed trades kept in memory; full history is in the ledger
     
     def validate(self) -> bool:
         """Validate logging configuration"""
@@ -39,7 +39,7 @@ class OrderAction(Enum):
     SELL = "SELL"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Option:
     """Represents a single option contract"""
     symbol: str
@@ -88,7 +88,7 @@ class Option:
         return self.ltp
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Strike:
     """Represents a strike price with call and put options"""
     strike_price: float
@@ -113,7 +113,7 @@ class Strike:
         return True
 
 
-@dataclass
+@dataclass(slots=True)
 class OptionsChain:
     """Represents the complete options chain for an underlying"""
     underlying_symbol: str
@@ -122,6 +122,12 @@ class OptionsChain:
     strikes: List[Strike] = field(default_factory=list)
     atm_strike: float = 0.0
     timestamp: datetime = field(default_factory=datetime.now)
+    # Strike price -> position in strikes for get_strike, and the strikes list
+    # it was built from; rebuilt when strikes is replaced, changes length or
+    # the entry at an indexed position no longer has that price
+    _strike_index: Dict[float, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed_strikes: Optional[List[Strike]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
     
     def validate(self) -> bool:
         """Validate options chain data"""
@@ -139,12 +145,60 @@ class OptionsChain:
         
         return True
     
+    def _index_strikes(self) -> None:
+        """Rebuild the strike price -> position index"""
+        index = {}
+        for position, strike in enumerate(self.strikes):
+            # First match wins, as with a scan of the list
+            index.setdefault(strike.strike_price, position)
+        self._strike_index = index
+        self._indexed_strikes = self.strikes
+        self._indexed_count = len(self.strikes)
+    
+    def _strike_position(self, strike_price: float) -> Optional[int]:
+        """Get the position of the first strike at a price, refreshing a stale index"""
+        strikes = self.strikes
+        if self._indexed_strikes is not strikes or self._indexed_count != len(strikes):
+            self._index_strikes()
+        
+        position = self._strike_index.get(strike_price)
+        if position is not None and strikes[position].strike_price != strike_price:
+            # Reordered, or an entry repriced in place
+            self._index_strikes()
+            position = self._strike_index.get(strike_price)
+        return position
+    
     def get_strike(self, strike_price: float) -> Optional[Strike]:
-        """Get strike by price"""
-        for strike in self.strikes:
-            if strike.strike_price == strike_price:
-                return strike
-        return None
+        """
+        Get strike by price.
+        
+        Appended strikes, strikes replaced at the same price and reordering
+        are picked up. A strike put in place of one at a different price may
+        not be found at its new price; use add_strike/replace_strike or
+        assign a new strikes list instead of changing prices in place.
+        """
+        position = self._strike_position(strike_price)
+        return self.strikes[position] if position is not None else None
+    
+    def add_strike(self, strike: Strike) -> None:
+        """Append a strike and add it to the lookup index"""
+        self._strike_position(strike.strike_price)
+        self.strikes.append(strike)
+        self._strike_index.setdefault(strike.strike_price, len(self.strikes) - 1)
+        self._indexed_count = len(self.strikes)
+    
+    def replace_strike(self, strike: Strike) -> bool:
+        """
+        Replace the strike at the same price, e.g. with fresh quotes.
+        
+        Returns:
+            True if a strike at that price was replaced
+        """
+        position = self._strike_position(strike.strike_price)
+        if position is None:
+            return False
+        self.strikes[position] = strike
+        return True
     
     def get_atm_strike_object(self) -> Optional[Strike]:
         """Get the ATM strike object"""
@@ -153,7 +207,7 @@ class OptionsChain:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeLeg:
     """Represents a single leg of a trade"""
     symbol: str
@@ -207,7 +261,7 @@ class TradeLeg:
             return (self.entry_price - self.exit_price) * self.quantity
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Represents a complete trade with multiple legs"""
     trade_id: str
@@ -220,6 +274,9 @@ class Trade:
     stop_loss: float = -1000.0  # Default stop loss
     status: TradeStatus = TradeStatus.OPEN
     metadata: Dict[str, Any] = field(default_factory=dict)
+    expiry_date: str = ""
+    max_profit: float = 0.0
+    max_loss: float = 0.0
     
     def validate(self) -> bool:
         """Validate trade data"""
@@ -271,7 +328,7 @@ class Trade:
         self.status = TradeStatus.CLOSED
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingSignal:
     """Represents a trading signal generated by a strategy"""
     strategy_name: str
@@ -327,7 +384,8 @@ class TradingSignal:
             entry_time=self.timestamp,
             target_pnl=self.target_pnl,
             stop_loss=self.stop_loss,
-            metadata=self.metadata.copy()
+            metadata=self.metadata.copy(),
+            expiry_date=self.expiry_date
         )
         
         # Create trade legs from signal
@@ -1011,6 +1011,9 @@ class TradingManager:
             if self.api_client:
                 self.api_client.cleanup()
             
+            if self.trade_reporter:
+                self.trade_reporter.cleanup()
+            
             if self.logging_manager:
                 self.logging_manager.cleanup()
             
@@ -283,6 +283,38 @@ class TestAnalyticsEngine:
         zero_avg = analytics_engine._calculate_average_holding_period(empty_trades)
         assert zero_avg == 0
     
+    def test_ledger_cache_reloads_on_change(self, analytics_engine, temp_csv_file):
+        """Test that the parsed ledger is reused until the file changes."""
+        first = analytics_engine._read_ledger()
+        assert analytics_engine._read_ledger() is first
+        
+        # Appending a trade changes the file, so it is parsed again
+        with open(temp_csv_file, 'a', newline='') as f:
+            csv.writer(f).writerow([
+                'WIN_003', 'directional', datetime.now().isoformat(), '', 'CLOSED',
+                'BANKNIFTY', '2024-12-26', 1, 2500.0, 1800.0, 300.0, 0.0, 300.0,
+                2000.0, -1000.0, 300.0, 0.0, 10.0, '[]', '{}'
+            ])
+        
+        metrics = analytics_engine.calculate_performance_metrics()
+        assert metrics.total_trades == 5
+        assert abs(metrics.total_pnl - 2075.0) < 0.01
+        
+        analytics_engine.clear_cache()
+        assert analytics_engine._ledger_cache is None
+    
+    def test_performance_metrics_memoized(self, analytics_engine):
+        """Test that repeated queries for the same window reuse the result."""
+        first = analytics_engine.calculate_performance_metrics(strategy="straddle")
+        second = analytics_engine.calculate_performance_metrics(strategy="straddle")
+        assert second is first
+        
+        other = analytics_engine.calculate_performance_metrics(strategy="directional")
+        assert other is not first
+        
+        analytics_engine.clear_cache()
+        assert analytics_engine.calculate_performance_metrics(strategy="straddle") is not first
+    
     def test_empty_metrics(self, analytics_engine):
         """Test empty metrics creation."""
         empty = analytics_engine._empty_metrics()
@@ -0,0 +1,196 @@
+"""
+Unit tests for the EmergencyController class.
+"""
+
+import threading
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.emergency.emergency_controller import (
+    EmergencyController, EmergencyEvent, EmergencyLevel, EmergencyType
+)
+
+
+class TestEmergencyController:
+    """Test cases for EmergencyController."""
+    
+    @pytest.fixture
+    def stop_file(self, tmp_path):
+        """Path of the emergency stop file used by the controller."""
+        return str(tmp_path / 'emergency_stop.txt')
+    
+    @pytest.fixture
+    def emergency_controller(self, stop_file):
+        """Create EmergencyController instance for testing."""
+        controller = EmergencyController({
+            'emergency_stop_file': stop_file,
+            'check_system_health': False
+        })
+        yield controller
+        controller.cleanup()
+    
+    @pytest.fixture
+    def event(self):
+        """Create a non-critical emergency event."""
+        return EmergencyEvent(
+            event_type=EmergencyType.API_FAILURE,
+            level=EmergencyLevel.HIGH,
+            message="API failure",
+            timestamp=datetime.now(),
+            source="test",
+            metadata={}
+        )
+    
+    def _start_callback_worker(self, controller):
+        """Start only the callback worker thread."""
+        controller._callback_thread = threading.Thread(
+            target=controller._callback_worker, daemon=True
+        )
+        controller._callback_thread.start()
+    
+    def _stop_callback_worker(self, controller):
+        """Drain the callback queue and stop the worker thread."""
+        controller._callback_queue.put(None)
+        controller._callback_thread.join(timeout=5)
+        assert not controller._callback_thread.is_alive()
+    
+    def test_callbacks_run_inline_without_worker(self, emergency_controller, event):
+        """Test that callbacks run on the caller's thread when no worker is running."""
+        callback = Mock()
+        emergency_controller.register_emergency_callback(EmergencyType.API_FAILURE, callback)
+        
+        emergency_controller._dispatch_callbacks(event)
+        
+        callback.assert_called_once_with(event)
+    
+    def test_callbacks_run_on_worker(self, emergency_controller, event):
+        """Test that callbacks are handed to the worker thread when it is running."""
+        threads = []
+        emergency_controller.register_emergency_callback(
+            EmergencyType.API_FAILURE, lambda e: threads.append(threading.current_thread())
+        )
+        self._start_callback_worker(emergency_controller)
+        
+        emergency_controller._dispatch_callbacks(event)
+        self._stop_callback_worker(emergency_controller)
+        
+        assert threads == [emergency_controller._callback_thread]
+    
+    def test_pending_callback_not_queued_twice(self, emergency_controller, event):
+        """Test that re-dispatching an event does not queue a callback that is still pending."""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def slow_callback(e):
+            calls.append(e)
+            started.set()
+            release.wait(timeout=5)
+        
+        emergency_controller.register_emergency_callback(EmergencyType.API_FAILURE, slow_callback)
+        self._start_callback_worker(emergency_controller)
+        
+        emergency_controller._dispatch_callbacks(event)
+        assert started.wait(timeout=5)
+        for _ in range(3):
+            emergency_controller._dispatch_callbacks(event)
+        assert emergency_controller._callback_queue.qsize() == 0
+        
+        release.set()
+        self._stop_callback_worker(emergency_controller)
+        
+        assert calls == [event]
+        assert not emergency_controller._pending_callbacks
+    
+    def test_callback_requeued_after_completion(self, emergency_controller, event):
+        """Test that an event can be dispatched again once its callback has finished."""
+        done = threading.Event()
+        callback = Mock(side_effect=lambda e: done.set())
+        emergency_controller.register_emergency_callback(EmergencyType.API_FAILURE, callback)
+        self._start_callback_worker(emergency_controller)
+        
+        emergency_controller._dispatch_callbacks(event)
+        assert done.wait(timeout=5)
+        self._stop_callback_worker(emergency_controller)
+        
+        self._start_callback_worker(emergency_controller)
+        emergency_controller._dispatch_callbacks(event)
+        self._stop_callback_worker(emergency_controller)
+        
+        assert callback.call_count == 2
+    
+    def test_bulk_cancel_preferred(self, emergency_controller):
+        """Test that pending orders are cancelled in one bulk call when a bulk callback is set."""
+        bulk_cancel = Mock()
+        order_cancel = Mock()
+        emergency_controller.register_bulk_cancel_callback(bulk_cancel)
+        emergency_controller.register_order_cancel_callback(order_cancel)
+        emergency_controller.update_pending_orders(['O1', 'O2', 'O3'])
+        
+        emergency_controller._cancel_all_pending_orders()
+        
+        bulk_cancel.assert_called_once_with(['O1', 'O2', 'O3'])
+        order_cancel.assert_not_called()
+    
+    def test_per_order_cancel_without_bulk_callback(self, emergency_controller):
+        """Test that each pending order is cancelled when only per-order callbacks are set."""
+        order_cancel = Mock()
+        emergency_controller.register_order_cancel_callback(order_cancel)
+        emergency_controller.update_pending_orders(['O1', 'O2'])
+        
+        emergency_controller._cancel_all_pending_orders()
+        
+        assert [c.args for c in order_cancel.call_args_list] == [('O1',), ('O2',)]
+    
+    def test_bulk_cancel_error_is_contained(self, emergency_controller):
+        """Test that a failing bulk cancel callback does not raise."""
+        emergency_controller.register_bulk_cancel_callback(Mock(side_effect=RuntimeError("broker down")))
+        emergency_controller.update_pending_orders(['O1'])
+        
+        emergency_controller._cancel_all_pending_orders()
+    
+    def test_no_cancel_without_pending_orders(self, emergency_controller):
+        """Test that no cancel call is made when there are no pending orders."""
+        bulk_cancel = Mock()
+        emergency_controller.register_bulk_cancel_callback(bulk_cancel)
+        
+        emergency_controller._cancel_all_pending_orders()
+        
+        bulk_cancel.assert_not_called()
+    
+    def test_status_checks_stop_file_when_not_watched(self, stop_file):
+        """Test that the status reports the stop file while monitoring without the file watcher."""
+        controller = EmergencyController({
+            'emergency_stop_file': stop_file,
+            'watch_stop_file': False
+        })
+        controller.monitoring_active = True
+        controller._build_tick_callables()
+        
+        assert controller._stop_file_check is None
+        assert controller.get_emergency_status()['emergency_stop_file_exists'] is False
+        
+        assert controller.create_emergency_stop_file("test")
+        assert controller.get_emergency_status()['emergency_stop_file_exists'] is True
+        
+        assert controller.remove_emergency_stop_file()
+        assert controller.get_emergency_status()['emergency_stop_file_exists'] is False
+    
+    def test_status_checks_stop_file_when_not_monitoring(self, emergency_controller):
+        """Test that the status reports the stop file before monitoring has started."""
+        assert emergency_controller.create_emergency_stop_file()
+        
+        assert emergency_controller.get_emergency_status()['emergency_stop_file_exists'] is True
+    
+    def test_status_uses_watcher_result(self, emergency_controller, stop_file):
+        """Test that the status uses the watcher's last check while the watcher is running."""
+        emergency_controller.monitoring_active = True
+        emergency_controller._build_tick_callables()
+        emergency_controller._check_emergency_stop_file(datetime.now())
+        
+        open(stop_file, 'w').close()
+        
+        # The watcher has not seen the new file yet
+        assert emergency_controller.get_emergency_status()['emergency_stop_file_exists'] is False
@@ -4,14 +4,18 @@ Unit tests for the LoggingManager class.
 Tests structured logging, data sanitization, and log management functionality.
 """
 
+import atexit
+import gc
 import json
+import logging
 import tempfile
+import weakref
 import pytest
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock, patch
 
-from src.logging.logging_manager import LoggingManager, JsonFormatter
+from src.logging.logging_manager import LoggingManager, JsonFormatter, BufferedRotatingFileHandler
 from src.models.config_models import LoggingConfig
 from src.models.trading_models import Trade, TradeLeg, TradingSignal, OptionType, OrderAction, SignalType
 
@@ -62,6 +66,7 @@ class TestLoggingManager:
             test_data,
             "INFO"
         )
+        logging_manager.flush()
         
         # Check that log file was created
         log_files = list(logging_manager.daily_log_dir.glob("system.log"))
@@ -77,6 +82,29 @@ class TestLoggingManager:
             assert log_entry["data"]["key"] == "value"
             assert log_entry["data"]["number"] == 123
     
+    def test_disabled_level_skips_entry(self, logging_manager):
+        """Test that events below the configured level are not built or logged."""
+        with patch.object(logging_manager, '_sanitize_data') as mock_sanitize:
+            logging_manager.log_system_event("DEBUG_EVENT", "Not logged", {"key": "value"}, "DEBUG")
+        
+        mock_sanitize.assert_not_called()
+        logging_manager.flush()
+        with open(logging_manager.daily_log_dir / "system.log", 'r') as f:
+            assert "DEBUG_EVENT" not in f.read()
+    
+    def test_event_timestamp_precision(self, logging_manager, logging_config):
+        """Test second-resolution timestamps by default and subsecond when enabled."""
+        timestamp = logging_manager._now_iso()
+        assert datetime.fromisoformat(timestamp).microsecond == 0
+        assert logging_manager._now_iso() in (timestamp, logging_manager._ts_cache[1])
+        
+        logging_config.subsecond_timestamps = True
+        precise_manager = LoggingManager(logging_config)
+        with patch('src.logging.logging_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 15, 10, 30, 0, 123456)
+            assert precise_manager._now_iso() == "2024-01-15T10:30:00.123456"
+        precise_manager.cleanup()
+    
     def test_data_sanitization(self, logging_manager):
         """Test sensitive data sanitization."""
         sensitive_data = {
@@ -99,6 +127,22 @@ class TestLoggingManager:
         assert sanitized["nested"]["password"] == "***REDACTED***"
         assert sanitized["nested"]["safe_field"] == "safe_value"
     
+    def test_data_sanitization_nested_lists(self, logging_manager):
+        """Test sanitization of dicts inside lists and the no-copy fast path."""
+        data = {
+            "orders": [{"order_id": "1", "token": "abc"}, {"order_id": "2"}, "raw"],
+            "meta": {"deep": {"secret_key": "xyz", "value": 1}}
+        }
+        
+        sanitized = logging_manager._sanitize_data(data)
+        
+        assert sanitized["orders"] == [{"order_id": "1", "token": "***REDACTED***"}, {"order_id": "2"}, "raw"]
+        assert sanitized["meta"]["deep"] == {"secret_key": "***REDACTED***", "value": 1}
+        assert data["orders"][0]["token"] == "abc"
+        
+        clean_data = {"orders": [{"order_id": "1"}], "count": 1}
+        assert logging_manager._sanitize_data(clean_data) is clean_data
+    
     def test_log_trade_event(self, logging_manager):
         """Test trade event logging."""
         # Create test trade
@@ -129,6 +173,19 @@ class TestLoggingManager:
         log_files = list(logging_manager.daily_log_dir.glob("errors.log"))
         assert len(log_files) == 1
     
+    def test_log_error_sanitizes_once(self, logging_manager):
+        """Test that log_error redacts additional data in a single pass."""
+        with patch.object(logging_manager, '_sanitize_data', wraps=logging_manager._sanitize_data) as mock_sanitize:
+            logging_manager.log_error(ValueError("bad"), "order placement", {"api_key": "abc", "order_id": "1"})
+        
+        assert mock_sanitize.call_count == 1
+        
+        logging_manager.flush()
+        with open(logging_manager.daily_log_dir / "system.log", 'r') as f:
+            log_entry = json.loads(f.readline())
+        
+        assert log_entry["data"]["additional_data"] == {"api_key": "***REDACTED***", "order_id": "1"}
+    
     def test_log_strategy_signal(self, logging_manager):
         """Test strategy signal logging."""
         signal = TradingSignal(
@@ -148,6 +205,16 @@ class TestLoggingManager:
         # Verify log was created
         log_files = list(logging_manager.daily_log_dir.glob("system.log"))
         assert len(log_files) == 1
+        
+        logging_manager.flush()
+        with open(log_files[0], 'r') as f:
+            log_entry = json.loads(f.readline())
+        
+        assert log_entry["event_type"] == "STRATEGY_SIGNAL"
+        assert log_entry["data"]["signal_type"] == SignalType.BUY.value
+        assert log_entry["data"]["option_types"] == [OptionType.CE.value]
+        assert log_entry["data"]["timestamp"] == signal.timestamp.isoformat()
+        assert log_entry["data"]["metadata"] == {"test": "data"}
     
     def test_log_performance_metrics(self, logging_manager):
         """Test performance metrics logging."""
@@ -163,6 +230,53 @@ class TestLoggingManager:
         log_files = list(logging_manager.daily_log_dir.glob("system.log"))
         assert len(log_files) == 1
     
+    def test_cleanup_writes_queued_records(self, logging_manager):
+        """Test that cleanup writes out queued records and detaches the queue."""
+        for i in range(50):
+            logging_manager.log_system_event("BULK_EVENT", f"Message {i}", {"index": i})
+        
+        logging_manager.cleanup()
+        
+        with open(logging_manager.daily_log_dir / "system.log", 'r') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        
+        assert [e["data"]["index"] for e in entries if e["event_type"] == "BULK_EVENT"] == list(range(50))
+        assert logging_manager._queue_handler not in logging_manager.system_logger.handlers
+        
+        # A second cleanup is a no-op
+        logging_manager.cleanup()
+    
+    def test_queued_exception_keeps_traceback_field(self, logging_manager):
+        """Test that records logged with exc_info keep a separate exception field."""
+        try:
+            raise ValueError("bad quote")
+        except ValueError:
+            logging_manager.system_logger.exception("Quote %s rejected", "BANKNIFTY")
+        logging_manager.flush()
+        
+        with open(logging_manager.daily_log_dir / 'system.log') as f:
+            entry = json.loads(f.read().splitlines()[-1])
+        
+        assert entry['message'] == "Quote BANKNIFTY rejected"
+        assert "ValueError: bad quote" in entry['exception']
+        assert "Traceback" not in entry['message']
+    
+    def test_abandoned_manager_is_released(self, logging_config):
+        """Test that the exit hook does not keep a logging manager alive."""
+        manager = LoggingManager(logging_config)
+        manager.log_system_event('TEST_EVENT', "Before release")
+        system_log = manager.daily_log_dir / 'system.log'
+        exit_hook = manager._exit_hook
+        manager_ref = weakref.ref(manager)
+        
+        del manager
+        gc.collect()
+        
+        assert manager_ref() is None
+        atexit.unregister(exit_hook)
+        with open(system_log) as f:
+            assert "Before release" in f.read()
+    
     def test_get_log_files(self, logging_manager):
         """Test getting log files for a date."""
         # Create a log entry to ensure files exist
@@ -187,6 +301,9 @@ class TestLoggingManager:
         # Create old directory structure
         old_date_dir = temp_log_dir / "2020-01-01"
         old_date_dir.mkdir()
+        (temp_log_dir / "2020-13-01").mkdir()
+        (temp_log_dir / "archive").mkdir()
+        (temp_log_dir / "2020-01-02").touch()
         
         # Run log rotation
         logging_manager.rotate_logs(days_to_keep=1)
@@ -224,6 +341,28 @@ class TestJsonFormatter:
         assert parsed["key"] == "value"
         assert parsed["number"] == 123
     
+    def test_format_preformatted_message(self, formatter):
+        """Test that preformatted JSON messages are passed through untouched."""
+        import logging
+        
+        message = '{"event_type": "TEST", "data": {"note": "₹ 100"}}'
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="",
+            lineno=1,
+            msg=message,
+            args=(),
+            exc_info=None
+        )
+        record.preformatted = True
+        
+        with patch('src.logging.logging_manager.json.loads') as mock_loads:
+            formatted = formatter.format(record)
+        
+        assert formatted == message
+        mock_loads.assert_not_called()
+    
     def test_format_regular_message(self, formatter):
         """Test formatting a regular text message."""
         import logging
@@ -278,4 +417,34 @@ class TestJsonFormatter:
         assert parsed["level"] == "ERROR"
         assert parsed["message"] == "Error occurred"
         assert "exception" in parsed
-        assert "ValueError: Test exception" in parsed["exception"]
\ No newline at end of file
+        assert "ValueError: Test exception" in parsed["exception"]
+
+class TestBufferedRotatingFileHandler:
+    """Test cases for BufferedRotatingFileHandler."""
+    
+    def test_buffers_until_flush(self, tmp_path):
+        """Test that records are held in the buffer until flushed."""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(log_file)
+        record = logging.LogRecord("test", logging.INFO, "", 0, "Buffered ünïcode", None, None)
+        
+        handler.emit(record)
+        assert log_file.read_text(encoding='utf-8') == ""
+        
+        handler.flush()
+        assert log_file.read_text(encoding='utf-8') == "Buffered ünïcode\n"
+        handler.close()
+    
+    def test_rolls_over_by_size(self, tmp_path):
+        """Test that the file rolls over once the byte counter exceeds maxBytes."""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(log_file, maxBytes=100, backupCount=2)
+        
+        for i in range(10):
+            handler.emit(logging.LogRecord("test", logging.INFO, "", 0, f"record {i:02d} " + "x" * 20, None, None))
+        handler.close()
+        
+        assert log_file.stat().st_size <= 100
+        assert (tmp_path / "buffered.log.1").stat().st_size <= 100
+        assert (tmp_path / "buffered.log.2").exists()
+        assert "record 09" in log_file.read_text(encoding='utf-8')
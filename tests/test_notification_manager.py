@@ -5,7 +5,9 @@ Tests notification delivery, message formatting, and rate limiting functionality
 """
 
 import json
+import smtplib
 import pytest
+from dataclasses import replace
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 
@@ -87,10 +89,9 @@ class TestNotificationManager:
         assert notification_manager.config == notification_config
         assert notification_manager.rate_limit_window == 300
         assert notification_manager.max_notifications_per_window == 10
-        assert len(notification_manager.last_notification_times) == 0
-        assert len(notification_manager.notification_counts) == 0
+        assert len(notification_manager._rate_windows) == 0
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_send_webhook_notification(self, mock_post, notification_manager):
         """Test webhook notification sending."""
         mock_response = Mock()
@@ -103,11 +104,13 @@ class TestNotificationManager:
         mock_post.assert_called_once()
         call_args = mock_post.call_args
         
-        assert call_args[1]['json']['title'] == "Test Title"
-        assert call_args[1]['json']['message'] == "Test Message"
-        assert call_args[1]['json']['alert_type'] == "info"
-        assert call_args[1]['json']['source'] == "banknifty-trading-system"
-        assert 'timestamp' in call_args[1]['json']
+        assert call_args[1]['headers'] == {"Content-Type": "application/json"}
+        payload = json.loads(call_args[1]['data'])
+        assert payload['title'] == "Test Title"
+        assert payload['message'] == "Test Message"
+        assert payload['alert_type'] == "info"
+        assert payload['source'] == "banknifty-trading-system"
+        assert 'timestamp' in payload
     
     @patch('smtplib.SMTP')
     def test_send_email_notification(self, mock_smtp, notification_manager):
@@ -120,8 +123,7 @@ class TestNotificationManager:
         notification_manager.config.email_to = ["recipient@example.com"]
         
         # Mock SMTP server
-        mock_server = Mock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
+        mock_server = mock_smtp.return_value
         
         notification_manager._send_email("Test Title", "Test Message", "info")
         
@@ -129,8 +131,22 @@ class TestNotificationManager:
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once_with("test@example.com", "password")
         mock_server.sendmail.assert_called_once()
+        
+        # A second email reuses the open connection
+        notification_manager._send_email("Second Title", "Second Message", "info")
+        
+        mock_smtp.assert_called_once()
+        mock_server.noop.assert_called_once()
+        assert mock_server.sendmail.call_count == 2
+        
+        # A dropped connection is reopened and the email retried
+        mock_server.sendmail.side_effect = [smtplib.SMTPServerDisconnected(), None]
+        notification_manager._send_email("Third Title", "Third Message", "info")
+        
+        assert mock_smtp.call_count == 2
+        assert mock_server.sendmail.call_count == 4
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_send_slack_notification(self, mock_post, notification_manager):
         """Test Slack notification sending."""
         mock_response = Mock()
@@ -143,7 +159,7 @@ class TestNotificationManager:
         mock_post.assert_called_once()
         call_args = mock_post.call_args
         
-        payload = call_args[1]['json']
+        payload = json.loads(call_args[1]['data'])
         assert len(payload['attachments']) == 1
         
         attachment = payload['attachments'][0]
@@ -152,7 +168,7 @@ class TestNotificationManager:
         assert attachment['color'] == "#2eb886"  # Success color
         assert attachment['footer'] == "Bank Nifty Trading System"
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_send_telegram_notification(self, mock_post, notification_manager):
         """Test Telegram notification sending."""
         # Configure Telegram settings
@@ -170,7 +186,7 @@ class TestNotificationManager:
         call_args = mock_post.call_args
         
         assert "bot" in call_args[0][0]  # URL contains bot token
-        payload = call_args[1]['json']
+        payload = json.loads(call_args[1]['data'])
         assert payload['chat_id'] == "test_chat_id"
         assert "⚠️ *Test Title*" in payload['text']
         assert "Test Message" in payload['text']
@@ -327,6 +343,19 @@ class TestNotificationManager:
         # Different type should not be rate limited
         assert not notification_manager._is_rate_limited("other_type")
     
+    def test_rate_limit_window_expiry(self, notification_manager):
+        """Test that sends leaving the window free up capacity."""
+        for i in range(notification_manager.max_notifications_per_window):
+            assert not notification_manager._is_rate_limited("test_type")
+        assert notification_manager._is_rate_limited("test_type")
+        
+        # Age the oldest send past the window
+        window = notification_manager._rate_windows["test_type"]
+        window[0] -= notification_manager.rate_limit_window + 1
+        
+        assert not notification_manager._is_rate_limited("test_type")
+        assert len(window) == notification_manager.max_notifications_per_window
+    
     def test_rate_limit_reset(self, notification_manager):
         """Test rate limit reset functionality."""
         # Trigger rate limit
@@ -391,7 +420,22 @@ class TestNotificationManager:
         assert "Stop Loss" in stop_message
         assert "limit further losses" in stop_message
     
-    @patch('requests.post')
+    def test_leg_pnl_sign_in_messages(self, notification_manager, sample_trade):
+        """Test that short and long legs are marked and signed by their action."""
+        long_leg = replace(sample_trade.legs[0], symbol="BANKNIFTY2412550000PE",
+                           option_type=OptionType.PE, action=OrderAction.BUY,
+                           entry_price=90.0, exit_price=60.0, current_price=60.0)
+        sample_trade.legs.append(long_leg)
+        
+        entry_lines = notification_manager._format_trade_entry_message(sample_trade).splitlines()
+        assert [line[0] for line in entry_lines if line.startswith(('📈', '📉'))] == ['📉', '📈']
+        
+        exit_message = notification_manager._format_trade_exit_message(sample_trade)
+        # Sold at 100, bought back at 80; bought at 90, sold at 60
+        assert "(₹+500.00)" in exit_message
+        assert "(₹-750.00)" in exit_message
+    
+    @patch('requests.Session.post')
     def test_notification_error_handling(self, mock_post, notification_manager, sample_trade):
         """Test error handling in notification sending."""
         # Make webhook fail
@@ -399,10 +443,46 @@ class TestNotificationManager:
         
         # Should not raise exception
         notification_manager.send_trade_entry_notification(sample_trade)
+        notification_manager.cleanup()
         
         # Verify webhook was attempted
         mock_post.assert_called()
     
+    def test_send_notification_is_async(self, notification_manager):
+        """Test that channel sends run off the calling thread."""
+        import threading
+        release = threading.Event()
+        calls = []
+        
+        def slow_webhook(title, message, alert_type):
+            release.wait(5)
+            calls.append(threading.current_thread().name)
+        
+        with patch.object(notification_manager, '_send_webhook', side_effect=slow_webhook), \
+             patch.object(notification_manager, '_send_slack'):
+            notification_manager._send_notification("Title", "Message", "info")
+            assert calls == []
+            
+            release.set()
+            notification_manager.cleanup()
+        
+        assert len(calls) == 1
+        assert calls[0].startswith("notify")
+    
+    @patch('requests.Session.post')
+    def test_http_channels_share_session(self, mock_post, notification_manager):
+        """Test that HTTP channels reuse one session and cleanup closes it."""
+        mock_post.return_value.raise_for_status.return_value = None
+        
+        notification_manager._send_webhook("Test Title", "Test Message", "info")
+        notification_manager._send_slack("Test Title", "Test Message", "info")
+        
+        assert mock_post.call_count == 2
+        
+        with patch.object(notification_manager._session, 'close') as mock_close:
+            notification_manager.cleanup()
+        mock_close.assert_called_once()
+    
     @patch.object(NotificationManager, '_send_webhook')
     @patch.object(NotificationManager, '_send_slack')
     def test_test_notifications(self, mock_slack, mock_webhook, notification_manager):
@@ -417,4 +497,22 @@ class TestNotificationManager:
         assert results[NotificationType.SLACK.value] == False
         
         mock_webhook.assert_called_once()
-        mock_slack.assert_called_once()
\ No newline at end of file
+        mock_slack.assert_called_once()
+    
+    def test_incomplete_channels_skipped(self, notification_config):
+        """Test that channels missing settings are not dispatched to."""
+        notification_config.types = [NotificationType.WEBHOOK, NotificationType.TELEGRAM]
+        manager = NotificationManager(notification_config)
+        
+        assert manager._active_channels == [NotificationType.WEBHOOK]
+        
+        with patch.object(manager, '_send_webhook') as mock_webhook, \
+             patch.object(manager, '_send_telegram') as mock_telegram:
+            manager._send_notification("Title", "Message", "info")
+            manager.cleanup()
+            
+            results = manager.test_notifications()
+        
+        mock_webhook.assert_called()
+        mock_telegram.assert_not_called()
+        assert results[NotificationType.TELEGRAM.value] == False
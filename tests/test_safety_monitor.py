@@ -0,0 +1,71 @@
+"""
+Unit tests for the SafetyMonitor class.
+"""
+
+import logging
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.emergency.emergency_controller import EmergencyController
+from src.emergency.safety_monitor import SafetyMonitor, SafetyCheckType
+
+
+class TestSafetyMonitor:
+    """Test cases for SafetyMonitor."""
+    
+    @pytest.fixture
+    def emergency_controller(self, tmp_path):
+        """Create EmergencyController instance for testing."""
+        return EmergencyController({
+            'emergency_stop_file': str(tmp_path / 'emergency_stop.txt')
+        })
+    
+    @pytest.fixture
+    def safety_monitor(self, emergency_controller):
+        """Create SafetyMonitor instance for testing."""
+        return SafetyMonitor({}, emergency_controller)
+    
+    def _tick(self, safety_monitor, now):
+        """Run the market-hours check and end-of-tick bookkeeping."""
+        safety_monitor._check_market_hours(now)
+        safety_monitor._clear_resolved_violations()
+    
+    def test_weekend_reported_once_and_kept_active(self, safety_monitor, caplog):
+        """Test that a weekend violation is reported once and not cleared until Monday."""
+        saturday = datetime(2025, 1, 4, 11, 0)
+        
+        with caplog.at_level(logging.INFO, logger='src.emergency.safety_monitor'):
+            for minute in range(3):
+                self._tick(safety_monitor, saturday.replace(minute=minute))
+        
+        weekend = [v for v in safety_monitor.safety_violations
+                   if v.check_type == SafetyCheckType.MARKET_HOURS]
+        assert len(weekend) == 1
+        assert "Safety condition cleared" not in caplog.text
+        
+        with caplog.at_level(logging.INFO, logger='src.emergency.safety_monitor'):
+            self._tick(safety_monitor, datetime(2025, 1, 6, 11, 0))
+        assert "Safety condition cleared: market_hours" in caplog.text
+    
+    def test_status_does_not_sample_while_monitoring(self, safety_monitor):
+        """Test that status reads reuse the monitor's sample instead of resetting CPU baselines."""
+        sample = safety_monitor._sample_resources()
+        safety_monitor.monitoring_active = True
+        
+        with patch('src.emergency.safety_monitor.psutil.cpu_percent') as cpu_percent, \
+                patch('src.emergency.safety_monitor.time.monotonic', return_value=sample.sampled_at + 3600):
+            status = safety_monitor.get_safety_status()
+        
+        cpu_percent.assert_not_called()
+        assert status['system_resources']['cpu_percent'] == sample.cpu_percent
+    
+    def test_status_samples_when_not_monitoring(self, safety_monitor):
+        """Test that status takes its own sample when no monitor is running."""
+        assert safety_monitor._last_resource_sample is None
+        
+        status = safety_monitor.get_safety_status()
+        
+        assert safety_monitor._last_resource_sample is not None
+        assert status['system_resources']['memory_percent'] is not None
@@ -4,12 +4,19 @@ Unit tests for the TradeReporter class.
 Tests trade ledger management, CSV export, and reporting functionality.
 """
 
+import atexit
 import csv
+import gc
+import io
 import json
+import os
 import tempfile
+import weakref
 import pytest
 from datetime import datetime, date, timedelta
+from dataclasses import replace
 from pathlib import Path
+from unittest.mock import patch
 
 from src.logging.trade_reporter import TradeReporter
 from src.models.config_models import LoggingConfig
@@ -36,7 +43,9 @@ class TestTradeReporter:
     @pytest.fixture
     def trade_reporter(self, logging_config):
         """Create TradeReporter instance for testing."""
-        return TradeReporter(logging_config)
+        reporter = TradeReporter(logging_config)
+        yield reporter
+        reporter.cleanup()
     
     @pytest.fixture
     def sample_trade(self):
@@ -99,12 +108,15 @@ class TestTradeReporter:
     
     def test_record_trade_entry(self, trade_reporter, sample_trade):
         """Test recording trade entry."""
+        sample_trade.max_profit = 4500.0
+        sample_trade.max_loss = -1800.0
         trade_reporter.record_trade_entry(sample_trade)
         
         # Check that trade is in active trades
         assert sample_trade.trade_id in trade_reporter.active_trades
         
         # Check that entry was written to CSV
+        trade_reporter.flush()
         with open(trade_reporter.trade_ledger_file, 'r') as f:
             reader = csv.DictReader(f)
             rows = list(reader)
@@ -113,6 +125,10 @@ class TestTradeReporter:
             row = rows[0]
             assert row['trade_id'] == sample_trade.trade_id
             assert row['strategy'] == sample_trade.strategy
+            assert row['underlying'] == sample_trade.underlying_symbol
+            assert row['expiry_date'] == sample_trade.expiry_date
+            assert float(row['max_profit']) == 4500.0
+            assert float(row['max_loss']) == -1800.0
             assert row['status'] == sample_trade.status.value
             assert float(row['total_pnl']) == sample_trade.current_pnl
     
@@ -130,6 +146,7 @@ class TestTradeReporter:
         assert trade_reporter.active_trades[sample_trade.trade_id].current_pnl == 1500.0
         
         # Check CSV has two entries
+        trade_reporter.flush()
         with open(trade_reporter.trade_ledger_file, 'r') as f:
             reader = csv.DictReader(f)
             rows = list(reader)
@@ -158,6 +175,123 @@ class TestTradeReporter:
         assert len(trade_reporter.completed_trades) == 1
         assert trade_reporter.completed_trades[0].trade_id == sample_trade.trade_id
     
+    def test_ledger_rows_batched(self, trade_reporter, sample_trade):
+        """Test that ledger rows are buffered until the batch fills or the reporter flushes."""
+        trade_reporter._batch_size = 3
+        
+        def ledger_rows():
+            with open(trade_reporter.trade_ledger_file, 'r') as f:
+                return list(csv.DictReader(f))
+        
+        trade_reporter.record_trade_entry(sample_trade)
+        trade_reporter.record_trade_update(sample_trade)
+        assert len(ledger_rows()) == 0
+        
+        trade_reporter.record_trade_update(sample_trade)
+        assert len(ledger_rows()) == 3
+        
+        trade_reporter.record_trade_update(sample_trade)
+        trade_reporter.cleanup()
+        assert len(ledger_rows()) == 4
+        assert trade_reporter._ledger_fd is None
+        
+        # Writing after cleanup reopens the ledger
+        trade_reporter.record_trade_exit(sample_trade)
+        assert len(ledger_rows()) == 5
+    
+    def test_failed_flush_keeps_only_unwritten_rows(self, trade_reporter, sample_trade):
+        """Test that rows written before a failed write are not written again."""
+        trade_reporter._batch_size = 10
+        trade_reporter.record_trade_entry(sample_trade)
+        for _ in range(2):
+            trade_reporter.record_trade_update(sample_trade)
+        
+        real_write = os.write
+        writes = []
+        
+        def failing_write(fd, data):
+            if len(writes) == 2:
+                raise OSError(28, "No space left on device")
+            writes.append(data)
+            return real_write(fd, data)
+        
+        with patch('os.write', side_effect=failing_write):
+            with pytest.raises(OSError):
+                trade_reporter.flush()
+        assert len(trade_reporter._pending_rows) == 1
+        
+        trade_reporter.flush()
+        with open(trade_reporter.trade_ledger_file, 'r') as f:
+            assert len(list(csv.DictReader(f))) == 3
+    
+    def test_short_write_appends_remainder(self, trade_reporter, sample_trade):
+        """Test that the rest of a partially written row is written once."""
+        trade_reporter.record_trade_entry(sample_trade)
+        real_write = os.write
+        calls = []
+        
+        def short_write(fd, data):
+            calls.append(len(data))
+            # First write only gets half the row in
+            return real_write(fd, data[:len(data) // 2] if len(calls) == 1 else data)
+        
+        with patch('os.write', side_effect=short_write):
+            trade_reporter.flush()
+        
+        assert len(calls) == 2
+        with open(trade_reporter.trade_ledger_file, 'r') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 1
+        assert rows[0]['trade_id'] == sample_trade.trade_id
+    
+    def test_abandoned_reporter_flushes_and_is_released(self, logging_config, sample_trade):
+        """Test that the exit hook does not keep a reporter alive."""
+        reporter = TradeReporter(logging_config)
+        reporter.record_trade_entry(sample_trade)
+        ledger_file = reporter.trade_ledger_file
+        exit_hook = reporter._exit_hook
+        reporter_ref = weakref.ref(reporter)
+        
+        del reporter
+        gc.collect()
+        
+        assert reporter_ref() is None
+        atexit.unregister(exit_hook)
+        with open(ledger_file, 'r') as f:
+            assert len(list(csv.DictReader(f))) == 1
+    
+    def test_closing_update_flushes(self, trade_reporter, sample_trade):
+        """Test that an update closing a trade is written immediately."""
+        trade_reporter.record_trade_entry(sample_trade)
+        sample_trade.status = TradeStatus.CLOSED
+        trade_reporter.record_trade_update(sample_trade)
+        
+        with open(trade_reporter.trade_ledger_file, 'r') as f:
+            assert len(list(csv.DictReader(f))) == 2
+    
+    def test_analytics_engine_sees_buffered_rows(self, trade_reporter, sample_trade):
+        """Test that the reporter's analytics engine flushes before reading."""
+        engine = trade_reporter.create_analytics_engine()
+        trade_reporter.record_trade_entry(sample_trade)
+        
+        assert len(engine._read_ledger()) == 1
+        assert not trade_reporter._pending_rows
+    
+    def test_completed_trades_capped(self, logging_config, sample_trade):
+        """Test that only the most recent closed trades are kept in memory."""
+        logging_config.completed_trades_cache = 2
+        reporter = TradeReporter(logging_config)
+        
+        for i in range(3):
+            trade = replace(sample_trade, trade_id=f"TEST_{i}")
+            reporter.record_trade_entry(trade)
+            reporter.record_trade_exit(trade)
+        reporter.cleanup()
+        
+        assert [t.trade_id for t in reporter.completed_trades] == ["TEST_1", "TEST_2"]
+        assert not reporter.active_trades
+        assert len(reporter.get_trade_history(days=1)) == 6
+    
     def test_pnl_calculations(self, trade_reporter, sample_trade):
         """Test P&L calculations in trade recording."""
         # Set exit prices for some legs to test realized P&L
@@ -166,6 +300,7 @@ class TestTradeReporter:
         trade_reporter.record_trade_entry(sample_trade)
         
         # Read the CSV and check P&L calculations
+        trade_reporter.flush()
         with open(trade_reporter.trade_ledger_file, 'r') as f:
             reader = csv.DictReader(f)
             row = next(reader)
@@ -178,6 +313,21 @@ class TestTradeReporter:
             assert float(row['realized_pnl']) > 0  # First leg closed profitably
             assert float(row['unrealized_pnl']) != 0  # Second leg still open
     
+    def test_pnl_calculations_buy_legs(self, trade_reporter, sample_trade):
+        """Test that BUY legs are signed as long positions in ledger P&L."""
+        for leg in sample_trade.legs:
+            leg.action = OrderAction.BUY
+        sample_trade.legs[0].exit_price = 120.0  # BUY at 100, exit at 120 = +500
+        
+        trade_reporter.record_trade_entry(sample_trade)
+        trade_reporter.flush()
+        
+        with open(trade_reporter.trade_ledger_file, 'r') as f:
+            row = next(csv.DictReader(f))
+        
+        assert float(row['realized_pnl']) == 500.0
+        assert float(row['unrealized_pnl']) == (75.0 - 95.0) * 25  # Second leg still open
+    
     def test_export_trades_csv(self, trade_reporter, sample_trade):
         """Test CSV export functionality."""
         # Record some trades
@@ -234,6 +384,37 @@ class TestTradeReporter:
         assert len(strategy_history) == 1
         assert strategy_history[0]['strategy'] == "directional"
     
+    def test_get_trade_history_cutoff(self, trade_reporter, sample_trade):
+        """Test that trades entered before the look-back window are excluded."""
+        sample_trade.entry_time = datetime.now() - timedelta(days=10)
+        trade_reporter.record_trade_entry(sample_trade)
+        
+        sample_trade.trade_id = "TEST_002"
+        sample_trade.entry_time = datetime.now()
+        trade_reporter.record_trade_entry(sample_trade)
+        
+        assert len(trade_reporter.get_trade_history(days=30)) == 2
+        
+        recent = trade_reporter.get_trade_history(days=5)
+        assert [row['trade_id'] for row in recent] == ["TEST_002"]
+    
+    def test_ledger_rows_shared_until_ledger_changes(self, trade_reporter, sample_trade):
+        """Test that report reads reuse parsed rows until the ledger is written."""
+        trade_reporter.record_trade_entry(sample_trade)
+        history = trade_reporter.get_trade_history()
+        rows = trade_reporter._load_ledger_rows()
+        
+        # History rows are copies; changing them leaves the shared rows intact
+        history[0]['strategy'] = 'changed'
+        assert trade_reporter._load_ledger_rows() is rows
+        assert rows[0]['strategy'] == sample_trade.strategy
+        
+        sample_trade.trade_id = "TEST_002"
+        trade_reporter.record_trade_entry(sample_trade)
+        trade_reporter.generate_daily_summary()
+        assert trade_reporter._load_ledger_rows() is not rows
+        assert len(trade_reporter._load_ledger_rows()) == 2
+    
     def test_get_active_trades_summary(self, trade_reporter, sample_trade):
         """Test active trades summary."""
         # Initially no active trades
@@ -343,11 +524,50 @@ class TestTradeReporter:
             assert file_summary['total_trades'] == summary['total_trades']
             assert file_summary['win_rate'] == summary['win_rate']
     
+    def test_ledger_row_formatting_matches_csv(self, trade_reporter, sample_trade):
+        """Test that ledger rows are formatted as csv.writer would."""
+        sample_trade.strategy = 'say "hi", twice'
+        sample_trade.metadata = {'note': 'line\nbreak'}
+        trade_reporter.record_trade_entry(sample_trade)
+        trade_reporter.flush()
+        
+        with open(trade_reporter.trade_ledger_file, 'r', newline='') as f:
+            f.readline()
+            line = f.readline()
+        row = next(csv.reader(io.StringIO(line)))
+        
+        expected = io.StringIO()
+        csv.writer(expected).writerow(row)
+        assert line == expected.getvalue()
+        assert row[1] == sample_trade.strategy
+        assert json.loads(row[-1]) == sample_trade.metadata
+    
+    def test_leg_details_follow_leg_changes(self, trade_reporter, sample_trade):
+        """Test that cached leg details are rebuilt when a leg changes."""
+        trade_reporter.record_trade_entry(sample_trade)
+        trade_reporter.record_trade_update(sample_trade)
+        
+        sample_trade.legs[1].current_price = 60.0
+        trade_reporter.record_trade_update(sample_trade)
+        trade_reporter.flush()
+        
+        with open(trade_reporter.trade_ledger_file, 'r') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert rows[0]['leg_details'] == rows[1]['leg_details']
+        assert json.loads(rows[1]['leg_details'])[1]['current_price'] == 75.0
+        assert json.loads(rows[2]['leg_details'])[1]['current_price'] == 60.0
+        assert json.dumps(json.loads(rows[2]['leg_details'])) == rows[2]['leg_details']
+        
+        trade_reporter.record_trade_exit(sample_trade)
+        assert sample_trade.trade_id not in trade_reporter._leg_json_cache
+    
     def test_leg_details_serialization(self, trade_reporter, sample_trade):
         """Test that leg details are properly serialized to JSON."""
         trade_reporter.record_trade_entry(sample_trade)
         
         # Read the CSV and check leg details
+        trade_reporter.flush()
         with open(trade_reporter.trade_ledger_file, 'r') as f:
             reader = csv.DictReader(f)
             row = next(reader)
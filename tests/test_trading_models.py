@@ -0,0 +1,159 @@
+"""
+Unit tests for the trading data models.
+"""
+
+import dataclasses
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+
+from src.models.trading_models import (
+    Option, OptionType, Strike, OptionsChain, Trade, TradeLeg, TradingSignal
+)
+
+
+def _option(strike_price, option_type=OptionType.CE):
+    return Option(
+        symbol=f"BANKNIFTY{int(strike_price)}{option_type.value}",
+        token=str(int(strike_price)),
+        strike_price=strike_price,
+        option_type=option_type,
+        expiry_date="2025-01-30",
+        ltp=100.0
+    )
+
+
+class TestOptionsChain:
+    """Test cases for OptionsChain."""
+    
+    @pytest.fixture
+    def options_chain(self):
+        """Create an options chain with three strikes."""
+        return OptionsChain(
+            underlying_symbol="BANKNIFTY",
+            underlying_price=50000.0,
+            expiry_date="2025-01-30",
+            strikes=[Strike(price, call_option=_option(price)) for price in (49900.0, 50000.0, 50100.0)],
+            atm_strike=50000.0
+        )
+    
+    def test_get_strike(self, options_chain):
+        """Test strike lookup by price."""
+        assert options_chain.get_strike(50100.0) is options_chain.strikes[2]
+        assert options_chain.get_strike(50200.0) is None
+        assert options_chain.get_atm_strike_object() is options_chain.strikes[1]
+    
+    def test_get_strike_after_append(self, options_chain):
+        """Test that the lookup index picks up strikes appended after first use."""
+        assert options_chain.get_strike(50200.0) is None
+        
+        new_strike = Strike(50200.0, call_option=_option(50200.0))
+        options_chain.strikes.append(new_strike)
+        
+        assert options_chain.get_strike(50200.0) is new_strike
+    
+    def test_get_strike_after_reassign(self, options_chain):
+        """Test that the lookup index is rebuilt when the strikes list is replaced."""
+        assert options_chain.get_strike(49900.0) is not None
+        
+        new_strike = Strike(49900.0, put_option=_option(49900.0, OptionType.PE))
+        options_chain.strikes = [new_strike] + options_chain.strikes[1:]
+        
+        assert options_chain.get_strike(49900.0) is new_strike
+    
+    def test_get_strike_after_in_place_replacement(self, options_chain):
+        """Test that a strike replaced in place at the same price is returned."""
+        assert options_chain.get_strike(50000.0) is options_chain.strikes[1]
+        
+        updated = Strike(50000.0, call_option=replace(_option(50000.0), ltp=250.0))
+        options_chain.strikes[1] = updated
+        
+        assert options_chain.get_strike(50000.0) is updated
+        assert options_chain.get_atm_strike_object().call_option.ltp == 250.0
+    
+    def test_get_strike_after_reorder(self, options_chain):
+        """Test that the lookup follows strikes after the list is sorted in place."""
+        assert options_chain.get_strike(49900.0) is not None
+        
+        options_chain.strikes.sort(key=lambda strike: -strike.strike_price)
+        
+        for strike in options_chain.strikes:
+            assert options_chain.get_strike(strike.strike_price) is strike
+    
+    def test_get_strike_after_remove_and_append(self, options_chain):
+        """Test that a removed strike is not returned after an append restores the length."""
+        assert options_chain.get_strike(49900.0) is not None
+        
+        new_strike = Strike(50200.0, call_option=_option(50200.0))
+        del options_chain.strikes[0]
+        options_chain.strikes.append(new_strike)
+        
+        assert options_chain.get_strike(49900.0) is None
+        assert options_chain.get_strike(50000.0) is options_chain.strikes[0]
+    
+    def test_add_strike(self, options_chain):
+        """Test that added strikes can be looked up."""
+        assert options_chain.get_strike(50200.0) is None
+        
+        new_strike = Strike(50200.0, call_option=_option(50200.0))
+        options_chain.add_strike(new_strike)
+        
+        assert options_chain.strikes[-1] is new_strike
+        assert options_chain.get_strike(50200.0) is new_strike
+    
+    def test_replace_strike(self, options_chain):
+        """Test that replace_strike swaps the strike at the same price."""
+        updated = Strike(50100.0, put_option=_option(50100.0, OptionType.PE))
+        
+        assert options_chain.replace_strike(updated)
+        assert options_chain.strikes[2] is updated
+        assert options_chain.get_strike(50100.0) is updated
+        assert not options_chain.replace_strike(Strike(51000.0, call_option=_option(51000.0)))
+        assert len(options_chain.strikes) == 3
+    
+    def test_get_strike_first_duplicate_wins(self, options_chain):
+        """Test that duplicate strike prices resolve to the first strike in the list."""
+        duplicate = Strike(50000.0, put_option=_option(50000.0, OptionType.PE))
+        options_chain.strikes.append(duplicate)
+        
+        assert options_chain.get_strike(50000.0) is options_chain.strikes[1]
+    
+    def test_index_excluded_from_equality(self, options_chain):
+        """Test that building the lookup index does not affect equality."""
+        other = dataclasses.replace(options_chain, strikes=list(options_chain.strikes))
+        options_chain.get_strike(50000.0)
+        
+        assert options_chain == other
+
+
+class TestSlottedModels:
+    """Test cases for the slotted model classes."""
+    
+    @pytest.mark.parametrize("model", [Option, Strike, OptionsChain, TradeLeg, Trade, TradingSignal])
+    def test_no_instance_dict(self, model):
+        """Test that model instances do not carry a __dict__."""
+        assert '__slots__' in vars(model)
+        assert '__dict__' not in dir(model)
+    
+    def test_option_is_frozen(self):
+        """Test that option contracts cannot be modified after creation."""
+        option = _option(50000.0)
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            option.ltp = 200.0
+    
+    def test_strike_is_frozen(self):
+        """Test that strikes cannot be modified after creation."""
+        strike = Strike(50000.0, call_option=_option(50000.0))
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            strike.call_option = None
+    
+    def test_trade_rejects_unknown_attributes(self):
+        """Test that a trade does not accept attributes outside its fields."""
+        trade = Trade(trade_id="T1", strategy="straddle", underlying_symbol="BANKNIFTY",
+                      entry_time=datetime(2025, 1, 6, 9, 30), legs=[], target_pnl=2000.0, stop_loss=-1000.0)
+        
+        with pytest.raises(AttributeError):
+            trade.unknown_field = 1